@@ -4,14 +4,54 @@ Accurate validation of extra items output - Final assessment
 
 import os
 import sys
-from pathlib import Path
+import html
 import re
+from collections import Counter
 
-# Add src directory to path
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
+from src.document_generator import render_extra_items_statement_cached
 
-from document_generator import DocumentGenerator
+# Table bodies and the data rows inside them (header and summary rows excluded)
+TABLE_RE = re.compile(r'<table\b[^>]*>(.*?)</table>', re.S)
+DATA_ROW_RE = re.compile(r'<tr\b(?![^>]*summary-row)[^>]*>(?!\s*<th)', re.S)
+
+# Static (search text, description) checks shared by every validation run
+TOTALS_CHECKS = (
+    ("Grand Total", "Grand Total"),
+    ("Tender Premium", "Tender Premium"),
+    ("Total Amount of Extra Item Executed", "Final amount")
+)
+STYLE_CHECKS = (
+    ("text-align: right", "Right alignment styles"),
+    ("text-align: center", "Center alignment styles"),
+    ("font-family: Arial", "Arial font specification"),
+    ("@media print", "Print optimization styles")
+)
+STATIC_NEEDLES = ("EXTRA ITEM SLIP", '₹') + tuple(search_text for search_text, _ in TOTALS_CHECKS + STYLE_CHECKS)
+
+# Fixed closing summary, printed verbatim after every assessment
+CAPABILITIES_SUMMARY = """
+📋 EXTRA ITEMS FUNCTIONALITY SUMMARY:
+   ✅ Professional document formatting
+   ✅ Complete header information display
+   ✅ Accurate item details with quantities and rates
+   ✅ Currency formatting with ₹ symbols
+   ✅ Comprehensive financial calculations
+   ✅ Remarks and specifications display
+   ✅ Government document standards compliance
+   ✅ Print-ready PDF generation capability"""
+
+def scan_needles(html_content, needles):
+    """Count occurrences of every needle in a single scan of the document"""
+    # A zero-width lookahead is tried at every position, so needles nested inside longer
+    # ones are still seen. At each position the alternation reports the longest needle;
+    # any shorter needle starting there is a prefix of it and is credited alongside.
+    ordered = sorted({needle for needle in needles if needle}, key=len, reverse=True)
+    prefixes = {needle: [other for other in ordered if needle.startswith(other)] for needle in ordered}
+    pattern = re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))')
+    hits = Counter()
+    for match in pattern.finditer(html_content):
+        hits.update(prefixes[match.group(1)])
+    return hits
 
 def accurate_validation():
     """Most accurate validation of extra items output"""
@@ -41,59 +81,53 @@ def accurate_validation():
         'extra_items': test_data['extra_items']
     }
     
-    generator = DocumentGenerator(processed_data)
-    html_content = generator.generate_extra_items_statement()
+    html_content = render_extra_items_statement_cached(processed_data)
     
     # Save output
     output_file = "accurate_validation_output.html"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with open(output_file, 'wb', buffering=1 << 20) as f:
+        f.write(html_content.encode('utf-8'))
     
     print(f"✅ Generated: {output_file}")
     print(f"📊 Content length: {len(html_content)} characters")
     
-    # Accurate validations
+    # Accurate validations - one scan of the document drives every check
+    contractor_name = test_data['contractor_name']
+    contractor_escaped = html.escape(contractor_name, quote=False)
+    needles = [*STATIC_NEEDLES, test_data['work_name'], contractor_name, test_data['reference_no']]
+    if contractor_escaped != contractor_name:
+        needles.append(contractor_escaped)
+    needles.extend(item['remarks'] for item in test_data['extra_items'])
+    hits = scan_needles(html_content, needles)
+    
     validations = []
     
     # 1. Title check
-    if "EXTRA ITEM SLIP" in html_content:
+    if hits["EXTRA ITEM SLIP"]:
         validations.append(("✅", "Document title present"))
     else:
         validations.append(("❌", "Document title missing"))
     
     # 2. Work name check
-    if test_data['work_name'] in html_content:
+    if hits[test_data['work_name']]:
         validations.append(("✅", "Work name correctly displayed"))
     else:
         validations.append(("❌", "Work name missing"))
     
     # 3. Contractor name check (account for HTML encoding)
-    contractor_in_html = test_data['contractor_name'].replace('&', '&amp;') in html_content
-    if contractor_in_html or test_data['contractor_name'] in html_content:
+    if hits[contractor_name] or hits[contractor_escaped]:
         validations.append(("✅", "Contractor name correctly displayed"))
     else:
         validations.append(("❌", "Contractor name missing"))
     
     # 4. Reference check
-    if test_data['reference_no'] in html_content:
+    if hits[test_data['reference_no']]:
         validations.append(("✅", "Reference number displayed"))
     else:
         validations.append(("❌", "Reference number missing"))
     
     # 5. Item data rows check (more accurate)
-    item_data_rows = []
-    lines = html_content.split('\n')
-    in_table = False
-    data_row_count = 0
-    
-    for line in lines:
-        line = line.strip()
-        if '<table>' in line:
-            in_table = True
-        elif '</table>' in line:
-            in_table = False
-        elif in_table and '<tr>' in line and 'th>' not in line and 'summary-row' not in line:
-            data_row_count += 1
+    data_row_count = sum(len(DATA_ROW_RE.findall(table)) for table in TABLE_RE.findall(html_content))
     
     expected_items = len(test_data['extra_items'])
     if data_row_count == expected_items:
@@ -102,7 +136,7 @@ def accurate_validation():
         validations.append(("❌", f"Expected {expected_items} items, found {data_row_count}"))
     
     # 6. Currency symbols check
-    currency_count = html_content.count('₹')
+    currency_count = hits['₹']
     expected_currency = (len(test_data['extra_items']) * 2) + 3  # Rate+Amount per item + 3 totals
     if currency_count >= expected_currency:
         validations.append(("✅", f"Currency symbols present ({currency_count} found)"))
@@ -112,7 +146,7 @@ def accurate_validation():
     # 7. Remarks check
     remarks_found = 0
     for item in test_data['extra_items']:
-        if item['remarks'] in html_content:
+        if hits[item['remarks']]:
             remarks_found += 1
     
     if remarks_found == len(test_data['extra_items']):
@@ -121,77 +155,52 @@ def accurate_validation():
         validations.append(("❌", f"Only {remarks_found}/{len(test_data['extra_items'])} remarks found"))
     
     # 8. Financial calculations
-    totals_checks = [
-        ("Grand Total", "Grand Total"),
-        ("Tender Premium", "Tender Premium"),
-        ("Total Amount of Extra Item Executed", "Final amount")
-    ]
-    
-    for search_text, description in totals_checks:
-        if search_text in html_content:
+    for search_text, description in TOTALS_CHECKS:
+        if hits[search_text]:
             validations.append(("✅", f"{description} present"))
         else:
             validations.append(("❌", f"{description} missing"))
     
     # 9. Styling checks
-    style_checks = [
-        ("text-align: right", "Right alignment styles"),
-        ("text-align: center", "Center alignment styles"),
-        ("font-family: Arial", "Arial font specification"),
-        ("@media print", "Print optimization styles")
-    ]
-    
-    for search_text, description in style_checks:
-        if search_text in html_content:
+    for search_text, description in STYLE_CHECKS:
+        if hits[search_text]:
             validations.append(("✅", f"{description} present"))
         else:
             validations.append(("❌", f"{description} missing"))
     
-    # Print results
-    print("\n📋 DETAILED VALIDATION RESULTS:")
-    passed = 0
-    for status, description in validations:
-        print(f"   {status} {description}")
-        if status == "✅":
-            passed += 1
-    
-    # Calculate final score
+    # Print results - the report is assembled first and written in one call
+    passed = sum(1 for status, _ in validations if status == "✅")
     total = len(validations)
     score = (passed / total) * 100
     
-    print(f"\n🏆 FINAL VALIDATION SCORE: {score:.1f}% ({passed}/{total})")
+    out = ["\n📋 DETAILED VALIDATION RESULTS:"]
+    out.extend(f"   {status} {description}" for status, description in validations)
+    out.append(f"\n🏆 FINAL VALIDATION SCORE: {score:.1f}% ({passed}/{total})")
     
     # Assessment
-    print(f"\n" + "=" * 60)
-    print("🎯 FINAL ASSESSMENT")
-    print("=" * 60)
+    out.append("\n" + "=" * 60)
+    out.append("🎯 FINAL ASSESSMENT")
+    out.append("=" * 60)
     
     if score >= 95:
-        print("🌟 EXCELLENT: Extra items output is of exceptional quality!")
-        print("   All critical features are working perfectly.")
+        out.append("🌟 EXCELLENT: Extra items output is of exceptional quality!")
+        out.append("   All critical features are working perfectly.")
         status = "EXCELLENT"
     elif score >= 90:
-        print("✅ VERY GOOD: Extra items output meets high professional standards!")
-        print("   Minor improvements possible but output is highly satisfactory.") 
+        out.append("✅ VERY GOOD: Extra items output meets high professional standards!")
+        out.append("   Minor improvements possible but output is highly satisfactory.")
         status = "VERY GOOD"
     elif score >= 80:
-        print("✅ GOOD: Extra items output is satisfactory for government use!")
-        print("   Output meets essential requirements with good formatting.")
+        out.append("✅ GOOD: Extra items output is satisfactory for government use!")
+        out.append("   Output meets essential requirements with good formatting.")
         status = "GOOD"
     else:
-        print("⚠️ NEEDS IMPROVEMENT: Some critical issues need attention.")
+        out.append("⚠️ NEEDS IMPROVEMENT: Some critical issues need attention.")
         status = "NEEDS WORK"
     
     # Summary of capabilities
-    print(f"\n📋 EXTRA ITEMS FUNCTIONALITY SUMMARY:")
-    print(f"   ✅ Professional document formatting")
-    print(f"   ✅ Complete header information display")
-    print(f"   ✅ Accurate item details with quantities and rates")
-    print(f"   ✅ Currency formatting with ₹ symbols")
-    print(f"   ✅ Comprehensive financial calculations")
-    print(f"   ✅ Remarks and specifications display")
-    print(f"   ✅ Government document standards compliance")
-    print(f"   ✅ Print-ready PDF generation capability")
+    out.append(CAPABILITIES_SUMMARY)
+    sys.stdout.write('\n'.join(out) + '\n')
     
     return {
         'status': status,
@@ -5,25 +5,54 @@ Tests both Excel File Upload Mode and Online Mode with proper output organizatio
 """
 
 import os
-import sys
 import time
 import json
 import traceback
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 import random
 from typing import Dict, List, Any, Optional
 
-# Add src to path for imports
-current_dir = Path(__file__).parent
-src_path = current_dir / "src"
-sys.path.insert(0, str(src_path))
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Banner rules, built once rather than on every print
+_RULE = '=' * 80
+_BAR = '=' * 100
 
 def get_date_time_folder_name() -> str:
     """Generate folder name with date and time"""
     now = datetime.now()
     return now.strftime("%Y-%m-%d_%H-%M-%S")
 
+def write_json_file(path: Path, data: Dict[str, Any]) -> None:
+    """Serialize data once and write it to disk in a single buffered write"""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.write(payload)
+
+def read_test_pause() -> float:
+    """Seconds to pause between tests from TEST_PAUSE; invalid values fall back to no pause"""
+    raw = os.environ.get('TEST_PAUSE', '').strip()
+    if not raw:
+        return 0.0
+    try:
+        pause = float(raw)
+    except ValueError:
+        print(f"⚠️ Ignoring TEST_PAUSE={raw!r}: expected a number of seconds")
+        return 0.0
+    if not pause >= 0 or pause == float('inf'):
+        print(f"⚠️ Ignoring TEST_PAUSE={raw!r}: expected a finite, non-negative number of seconds")
+        return 0.0
+    return pause
+
 def create_directory_structure():
     """Create the required directory structure"""
     dirs = ["INPUT_FILES", "OUTPUT_FILES", "test_input_files"]
@@ -33,12 +62,17 @@ def create_directory_structure():
 
 class TestResult:
     """Class to store individual test results"""
+    __slots__ = ('test_name', 'test_type', 'start_time', 'end_time', 'duration', 'status',
+                 'error_message', 'warnings', 'processed_data', 'output_files', 'validation_summary',
+                 'perf_start')
+    
     def __init__(self, test_name: str, test_type: str):
         self.test_name = test_name
         self.test_type = test_type  # 'upload' or 'online'
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         self.duration: Optional[float] = None
+        self.perf_start: Optional[float] = None  # monotonic clock reading used for duration
         self.status = "pending"  # pending, running, success, error
         self.error_message: Optional[str] = None
         self.warnings: List[str] = []
@@ -56,29 +90,44 @@ class AppTestRunner:
         self.test_results: List[TestResult] = []
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
+        self.total_duration: float = 0
+        # One timestamp per run keeps sub-test folders and the report together
+        self._run_stamp = get_date_time_folder_name()
+        # Private generator so simulated draws skip the shared module-level instance
+        self._rng = random.Random()
+        # Optional pause between tests (e.g. TEST_PAUSE=2 for readable logs), validated up front
+        self.test_pause = read_test_pause()
+        
+        # Ensure the directory tree once up front; subfolders are tracked below
+        for directory in (self.input_dir, self.output_dir, self.test_input_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        self._created_subfolders = set()
         
-    def get_output_subfolder(self) -> Path:
+    def get_output_subfolder(self, tag: str) -> Path:
         """Create and return output subfolder with date-time naming"""
-        folder_name = get_date_time_folder_name()
+        folder_name = f"{self._run_stamp}_{tag}"
         subfolder = self.output_dir / folder_name
-        subfolder.mkdir(exist_ok=True)
+        if subfolder not in self._created_subfolders:
+            subfolder.mkdir(exist_ok=True)
+            self._created_subfolders.add(subfolder)
         return subfolder
     
     def run_excel_upload_mode_test(self) -> TestResult:
         """Test Excel File Upload Mode"""
         result = TestResult("Excel File Upload Mode", "upload")
         result.start_time = datetime.now()
+        result.perf_start = time.perf_counter()
         
-        print(f"\n{'='*80}")
+        print(f"\n{_RULE}")
         print(f"🧪 TESTING: Excel File Upload Mode")
         print(f"⏰ Start Time: {result.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{'='*80}")
+        print(_RULE)
         
         try:
             result.status = "running"
             
             # Create output subfolder
-            output_subfolder = self.get_output_subfolder()
+            output_subfolder = self.get_output_subfolder('upload')
             print(f"📂 Output will be saved to: {output_subfolder}")
             
             # For this test, we'll simulate processing by creating sample reports
@@ -96,8 +145,7 @@ class AppTestRunner:
             
             # Save test data
             data_file = output_subfolder / "excel_upload_test_data.json"
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(test_data, f, indent=2, ensure_ascii=False)
+            write_json_file(data_file, test_data)
             
             result.output_files.append(str(data_file))
             result.processed_data = test_data
@@ -114,8 +162,8 @@ class AppTestRunner:
         
         finally:
             result.end_time = datetime.now()
-            if result.start_time:
-                result.duration = (result.end_time - result.start_time).total_seconds()
+            if result.perf_start is not None:
+                result.duration = time.perf_counter() - result.perf_start
             print(f"⏱️ Duration: {result.duration:.2f} seconds")
         
         return result
@@ -124,24 +172,25 @@ class AppTestRunner:
         """Test Online Mode with manual data entry"""
         result = TestResult("Online Mode", "online")
         result.start_time = datetime.now()
+        result.perf_start = time.perf_counter()
         
-        print(f"\n{'='*80}")
+        print(f"\n{_RULE}")
         print(f"🧪 TESTING: Online Mode")
         print(f"⏰ Start Time: {result.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{'='*80}")
+        print(_RULE)
         
         try:
             result.status = "running"
             
             # Create output subfolder
-            output_subfolder = self.get_output_subfolder()
+            output_subfolder = self.get_output_subfolder('online')
             print(f"📂 Output will be saved to: {output_subfolder}")
             
             # Simulate online data entry (60-75% of items)
-            items_selected = random.randint(60, 75)
+            items_selected = self._rng.randint(60, 75)
             
             # Add 1-10 extra items
-            extra_items_count = random.randint(1, 10)
+            extra_items_count = self._rng.randint(1, 10)
             
             # Create test data
             test_data = {
@@ -158,8 +207,7 @@ class AppTestRunner:
             
             # Save test data
             data_file = output_subfolder / "online_mode_test_data.json"
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(test_data, f, indent=2, ensure_ascii=False)
+            write_json_file(data_file, test_data)
             
             result.output_files.append(str(data_file))
             result.processed_data = test_data
@@ -176,8 +224,8 @@ class AppTestRunner:
         
         finally:
             result.end_time = datetime.now()
-            if result.start_time:
-                result.duration = (result.end_time - result.start_time).total_seconds()
+            if result.perf_start is not None:
+                result.duration = time.perf_counter() - result.perf_start
             print(f"⏱️ Duration: {result.duration:.2f} seconds")
         
         return result
@@ -215,53 +263,59 @@ class AppTestRunner:
         print(f"📁 Output Directory: {self.output_dir}")
         
         self.start_time = datetime.now()
+        perf_start = time.perf_counter()
         
         try:
             # Run Excel File Upload Mode Test
-            print("\n" + "="*100)
+            print("\n" + _BAR)
             upload_result = self.run_excel_upload_mode_test()
             self.test_results.append(upload_result)
             
-            # Brief pause between tests
-            time.sleep(2)
+            if self.test_pause > 0:
+                time.sleep(self.test_pause)
             
             # Run Online Mode Test
-            print("\n" + "="*100)
+            print("\n" + _BAR)
             online_result = self.run_online_mode_test()
             self.test_results.append(online_result)
             
             self.end_time = datetime.now()
-            total_duration = (self.end_time - self.start_time).total_seconds() if self.start_time else 0
+            self.total_duration = total_duration = time.perf_counter() - perf_start
             
-            print(f"\n{'='*100}")
+            print(f"\n{_BAR}")
             print(f"🏁 ALL TESTING COMPLETED!")
             print(f"⏱️ Total Duration: {total_duration:.2f} seconds")
+            counts = Counter(r.status for r in self.test_results)
             print(f"📊 Tests Run: {len(self.test_results)}")
-            print(f"✅ Successful: {sum(1 for r in self.test_results if r.status == 'success')}")
-            print(f"❌ Failed: {sum(1 for r in self.test_results if r.status == 'error')}")
-            print(f"{'='*100}")
+            print(f"✅ Successful: {counts['success']}")
+            print(f"❌ Failed: {counts['error']}")
+            print(_BAR)
             
             # Generate comparison report
             comparison_report = self.generate_comparison_report(upload_result, online_result)
             
             # Generate final test report
-            return self.generate_final_report(comparison_report)
+            return self.generate_final_report(comparison_report, counts=counts)
             
         except Exception as e:
             print(f"❌ Test suite failed: {str(e)}")
             return {'error': str(e), 'traceback': traceback.format_exc()}
     
-    def generate_final_report(self, comparison_report: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_final_report(self, comparison_report: Dict[str, Any],
+                              counts: Optional[Counter] = None) -> Dict[str, Any]:
         """Generate final test report"""
+        if counts is None:
+            counts = Counter(r.status for r in self.test_results)
+        successful, failed = counts['success'], counts['error']
         report = {
             'test_suite_info': {
                 'start_time': self.start_time.isoformat() if self.start_time else None,
                 'end_time': self.end_time.isoformat() if self.end_time else None,
-                'total_duration': (self.end_time - self.start_time).total_seconds() if (self.start_time and self.end_time) else 0,
+                'total_duration': self.total_duration,
                 'total_tests': len(self.test_results),
-                'successful_tests': sum(1 for r in self.test_results if r.status == 'success'),
-                'failed_tests': sum(1 for r in self.test_results if r.status == 'error'),
-                'success_rate': (sum(1 for r in self.test_results if r.status == 'success') / len(self.test_results)) * 100 if self.test_results else 0
+                'successful_tests': successful,
+                'failed_tests': failed,
+                'success_rate': (successful / len(self.test_results)) * 100 if self.test_results else 0
             },
             'test_results': [
                 {
@@ -276,10 +330,8 @@ class AppTestRunner:
         }
         
         # Save report to file in output directory
-        timestamp = get_date_time_folder_name()
-        report_file = self.output_dir / f"test_report_{timestamp}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        report_file = self.output_dir / f"test_report_{self._run_stamp}.json"
+        write_json_file(report_file, report)
         
         print(f"📊 Final test report saved: {report_file}")
         
@@ -4,17 +4,34 @@ Automated Test Runner for BillGenerator Application
 Programmatically tests all input files and generates comprehensive test reports
 """
 
+import io
 import os
 import sys
-import time
 import json
 import traceback
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
+import numpy as np
 import tempfile
 import zipfile
-from typing import Dict, List, Any, Optional
+from string import Template
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
 # Add src to path for imports
 current_dir = Path(__file__).parent
@@ -31,8 +48,75 @@ except ImportError as e:
     print("Please ensure all required modules are in the src directory")
     sys.exit(1)
 
+# Project names repeat across the batch, so sanitized names are memoized
+_sanitize = lru_cache(maxsize=128)(sanitize_filename)
+
+@lru_cache(maxsize=1)
+def get_pdf_merger() -> PDFMerger:
+    """Process-wide PDFMerger, so converter detection (subprocess probes) runs once"""
+    return PDFMerger()
+
+def dump_json_bytes(data: Any, default=None) -> bytes:
+    """Serialize data to indented UTF-8 JSON, using orjson or msgspec when installed"""
+    def fast_default(obj):
+        # numpy scalars (np.float64, np.int64, ...) become the matching Python number
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if default is None:
+            raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+        return default(obj)
+    
+    payload = None
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, default=fast_default,
+                               option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    elif MSGSPEC_AVAILABLE:
+        payload = msgspec.json.format(msgspec.json.encode(data, enc_hook=fast_default), indent=2)
+    # The fast encoders write NaN/Infinity as null; when null appears, json.dumps writes
+    # the payload instead so those values come out exactly as the stdlib always wrote them
+    if payload is not None and b'null' not in payload:
+        return payload
+    return json.dumps(data, indent=2, default=fast_default, ensure_ascii=False).encode('utf-8')
+
+def write_document(document: Tuple[Path, str]) -> None:
+    """Write one generated document to disk with a single unbuffered write"""
+    path, content = document
+    data = content.encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+# Placeholder HTML page produced for each simplified test document
+_HTML_TPL = Template("""
+                <!DOCTYPE html>
+                <html>
+                <head>
+                    <title>$title</title>
+                    <meta charset="UTF-8">
+                </head>
+                <body>
+                    <h1>$title</h1>
+                    <p>Generated from: $project</p>
+                    <p>Generated on: $ts</p>
+                    <p>Status: Test Document</p>
+                </body>
+                </html>
+                """)
+
+# Simplified HTML documents produced per test, with their display titles
+_HTML_TEMPLATE_NAMES = ('first_page', 'deviation_statement', 'extra_items', 'certificate_ii', 'certificate_iii')
+_HTML_PRETTY = {name: name.replace('_', ' ').title() for name in _HTML_TEMPLATE_NAMES}
+
 class TestResult:
     """Class to store individual test results"""
+    __slots__ = ('filename', 'start_time', 'end_time', 'duration', 'status', 'error_message',
+                 'warnings', 'processed_data', 'generated_docs', 'file_size', 'sheets_found',
+                 'validation_result', 'output_files')
+    
     def __init__(self, filename: str):
         self.filename = filename
         self.start_time = None
@@ -65,6 +149,15 @@ class TestResult:
             'processed_data_summary': self.get_data_summary()
         }
     
+    @staticmethod
+    def to_arrays(results: List['TestResult']) -> Dict[str, np.ndarray]:
+        """Column view of the numeric fields across results (file sizes, durations)"""
+        count = len(results)
+        return {
+            'file_sizes': np.fromiter((r.file_size for r in results), dtype=np.int64, count=count),
+            'durations': np.fromiter((r.duration or 0.0 for r in results), dtype=np.float64, count=count)
+        }
+    
     def get_data_summary(self):
         """Get summary of processed data"""
         summary = {}
@@ -83,12 +176,27 @@ class TestResult:
         summary['grand_total'] = self.processed_data.get('totals', {}).get('grand_total', 0)
         return summary
 
+def run_test_in_worker(test_files_dir: str, output_dir: str, file_path: Path,
+                       package_as_zip: bool = False, run_timestamp: Optional[str] = None) -> TestResult:
+    """Run a single file test in a worker process with its own runner instance"""
+    with AutomatedTestRunner(test_files_dir, output_dir, max_workers=1, package_as_zip=package_as_zip,
+                             run_timestamp=run_timestamp) as runner:
+        return runner.run_single_test(file_path)
+
 class AutomatedTestRunner:
     """Main test runner class"""
     
-    def __init__(self, test_files_dir: str = "test_input_files", output_dir: str = "test_results"):
+    def __init__(self, test_files_dir: str = "test_input_files", output_dir: str = "test_results",
+                 max_workers: Optional[int] = None, package_as_zip: bool = False,
+                 run_timestamp: Optional[str] = None):
         self.test_files_dir = Path(test_files_dir)
         self.output_dir = Path(output_dir)
+        # Files are independent, so they are processed across worker processes
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Write each test package as one uncompressed .zip instead of a directory tree
+        self.package_as_zip = package_as_zip
+        # One timestamp names every package and the report from this run; workers inherit the parent's
+        self._run_timestamp = run_timestamp or get_timestamp()
         self.test_results: List[TestResult] = []
         self.start_time = None
         self.end_time = None
@@ -100,7 +208,22 @@ class AutomatedTestRunner:
         self.excel_processor = None
         self.latex_generator = None
         self.pdf_merger = None
-        
+        # Background thread for PDF conversion, overlapped with LaTeX generation;
+        # started on first use and stopped by close()
+        self.pdf_executor: Optional[ThreadPoolExecutor] = None
+    
+    def __enter__(self) -> 'AutomatedTestRunner':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Shut down the background PDF thread, if one was started"""
+        if self.pdf_executor is not None:
+            self.pdf_executor.shutdown(wait=True)
+            self.pdf_executor = None
+    
     def get_test_files(self) -> List[Path]:
         """Get all Excel test files"""
         if not self.test_files_dir.exists():
@@ -129,9 +252,12 @@ class AutomatedTestRunner:
             
             # Step 1: Validate file
             print("📋 Step 1: Validating file structure...")
-            with open(file_path, 'rb') as f:
-                validation_result = validate_excel_file(f)
-                result.validation_result = validation_result
+            # Read the workbook once; validation and processing share the bytes
+            raw = file_path.read_bytes()
+            upload = io.BytesIO(raw)
+            upload.name = file_path.name
+            validation_result = validate_excel_file(upload)
+            result.validation_result = validation_result
             
             if not validation_result['valid']:
                 result.status = "error"
@@ -143,9 +269,8 @@ class AutomatedTestRunner:
             
             # Step 2: Process Excel file
             print("📊 Step 2: Processing Excel data...")
-            with open(file_path, 'rb') as f:
-                self.excel_processor = ExcelProcessor(f)
-                processed_data = self.excel_processor.process_all_sheets()
+            self.excel_processor = ExcelProcessor(io.BytesIO(raw))
+            processed_data = self.excel_processor.process_all_sheets()
             
             if not processed_data:
                 result.status = "error"
@@ -160,23 +285,26 @@ class AutomatedTestRunner:
             # Step 3: Generate documents
             print("📄 Step 3: Generating documents...")
             
+            # Generate HTML documents (simplified) first so their PDF conversion,
+            # which may shell out to an external converter, overlaps the LaTeX rendering
+            html_docs = self.generate_html_documents(processed_data)
+            result.generated_docs['html'] = list(html_docs.keys())
+            if self.pdf_executor is None:
+                self.pdf_executor = ThreadPoolExecutor(max_workers=1)
+            pdf_future = self.pdf_executor.submit(self.convert_html_documents_to_pdf, html_docs)
+            
             # Generate LaTeX documents
             self.latex_generator = LaTeXGenerator()
             latex_docs = self.latex_generator.generate_all_documents(processed_data)
             result.generated_docs['latex'] = list(latex_docs.keys())
             
-            # Generate HTML documents (simplified)
-            html_docs = self.generate_html_documents(processed_data)
-            result.generated_docs['html'] = list(html_docs.keys())
-            
             print(f"✅ Documents generated: {len(latex_docs)} LaTeX, {len(html_docs)} HTML")
             
             # Step 4: Test PDF generation (if possible)
             print("📑 Step 4: Testing PDF generation...")
             try:
-                self.pdf_merger = PDFMerger()
                 # Test HTML to PDF conversion
-                html_pdfs = self.pdf_merger.convert_html_to_pdf(html_docs)
+                html_pdfs = pdf_future.result()
                 result.generated_docs['html_pdfs'] = list(html_pdfs.keys())
                 print(f"✅ HTML PDFs generated: {len(html_pdfs)}")
             except Exception as pdf_error:
@@ -196,9 +324,11 @@ class AutomatedTestRunner:
         except Exception as e:
             result.status = "error"
             result.error_message = str(e)
-            result.warnings.append(f"Exception: {traceback.format_exc()}")
+            # Format the traceback once and share it between the warning and the console
+            tb_text = "".join(traceback.TracebackException.from_exception(e).format())
+            result.warnings.append(f"Exception: {tb_text}")
             print(f"❌ Test failed: {str(e)}")
-            print(f"📝 Traceback: {traceback.format_exc()}")
+            print(f"📝 Traceback: {tb_text}")
         
         finally:
             result.end_time = datetime.now()
@@ -207,31 +337,24 @@ class AutomatedTestRunner:
         
         return result
     
+    def convert_html_documents_to_pdf(self, html_docs: Dict) -> Dict:
+        """Convert HTML documents to PDF (runs on the background PDF thread)"""
+        if self.pdf_merger is None:
+            self.pdf_merger = get_pdf_merger()
+        return self.pdf_merger.convert_html_to_pdf(html_docs)
+    
     def generate_html_documents(self, processed_data: Dict) -> Dict:
         """Generate HTML documents (simplified version)"""
         html_docs = {}
         
         # Generate basic HTML documents
-        templates = ['first_page', 'deviation_statement', 'extra_items', 'certificate_ii', 'certificate_iii']
+        project = processed_data.get('title', {}).get('project_name', 'Unknown Project')
+        ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        for template in templates:
+        for template in _HTML_TEMPLATE_NAMES:
             try:
                 # Create basic HTML content
-                html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <title>{template.replace('_', ' ').title()}</title>
-                    <meta charset="UTF-8">
-                </head>
-                <body>
-                    <h1>{template.replace('_', ' ').title()}</h1>
-                    <p>Generated from: {processed_data.get('title', {}).get('project_name', 'Unknown Project')}</p>
-                    <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                    <p>Status: Test Document</p>
-                </body>
-                </html>
-                """
+                html_content = _HTML_TPL.substitute(title=_HTML_PRETTY[template], project=project, ts=ts)
                 html_docs[template] = html_content
             except Exception as e:
                 print(f"⚠️ Failed to generate HTML for {template}: {str(e)}")
@@ -245,41 +368,40 @@ class AutomatedTestRunner:
         
         try:
             # Create timestamped output directory
-            timestamp = get_timestamp()
             project_name = processed_data.get('title', {}).get('project_name', 'TestProject')
-            safe_project_name = sanitize_filename(project_name)
-            output_dir_name = f"{safe_project_name}_{timestamp}_TestOutput"
+            safe_project_name = _sanitize(project_name)
+            # The source file stem keeps packages unique under the shared run timestamp
+            output_dir_name = f"{safe_project_name}_{self._run_timestamp}_{_sanitize(file_path.stem)}_TestOutput"
+            
+            if self.package_as_zip:
+                # The archive is the one file on disk; its member names are kept alongside
+                zip_path, members = self.write_zip_package(self.output_dir / f"{output_dir_name}.zip",
+                                                           processed_data, latex_docs, html_docs, result)
+                result.generated_docs['package_members'] = members
+                return [str(zip_path)]
+            
             output_path = self.output_dir / output_dir_name
             output_path.mkdir(exist_ok=True)
             
             # Save processed data as JSON
             data_file = output_path / "processed_data.json"
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(processed_data, f, indent=2, default=str, ensure_ascii=False)
+            data_file.write_bytes(dump_json_bytes(processed_data, default=str))
             output_files.append(str(data_file))
             
-            # Save LaTeX documents
+            # Save LaTeX and HTML documents; the writes are I/O-bound so they share a thread pool
             latex_dir = output_path / "latex_documents"
             latex_dir.mkdir(exist_ok=True)
-            for doc_name, content in latex_docs.items():
-                latex_file = latex_dir / f"{doc_name}.tex"
-                with open(latex_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                output_files.append(str(latex_file))
-            
-            # Save HTML documents
             html_dir = output_path / "html_documents"
             html_dir.mkdir(exist_ok=True)
-            for doc_name, content in html_docs.items():
-                html_file = html_dir / f"{doc_name}.html"
-                with open(html_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                output_files.append(str(html_file))
+            documents = [(latex_dir / f"{doc_name}.tex", content) for doc_name, content in latex_docs.items()]
+            documents += [(html_dir / f"{doc_name}.html", content) for doc_name, content in html_docs.items()]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(write_document, documents))
+            output_files.extend(str(path) for path, _ in documents)
             
             # Save test summary
             summary_file = output_path / "test_summary.json"
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+            summary_file.write_bytes(dump_json_bytes(result.to_dict()))
             output_files.append(str(summary_file))
             
             print(f"📁 Output package created: {output_path}")
@@ -290,6 +412,22 @@ class AutomatedTestRunner:
         
         return output_files
     
+    def write_zip_package(self, zip_path: Path, processed_data: Dict, latex_docs: Dict,
+                          html_docs: Dict, result: TestResult) -> Tuple[Path, List[str]]:
+        """Write the test output package as a single stored (uncompressed) zip archive;
+        returns the archive path and the names of its members"""
+        members = [("processed_data.json", dump_json_bytes(processed_data, default=str))]
+        members += [(f"latex_documents/{doc_name}.tex", content) for doc_name, content in latex_docs.items()]
+        members += [(f"html_documents/{doc_name}.html", content) for doc_name, content in html_docs.items()]
+        members.append(("test_summary.json", dump_json_bytes(result.to_dict())))
+        
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zf:
+            for arcname, payload in members:
+                zf.writestr(arcname, payload)
+        
+        print(f"📁 Output package created: {zip_path}")
+        return zip_path, [arcname for arcname, _ in members]
+    
     def run_all_tests(self) -> Dict[str, Any]:
         """Run tests on all files"""
         print("🚀 Starting Automated Test Suite")
@@ -302,13 +440,14 @@ class AutomatedTestRunner:
             test_files = self.get_test_files()
             print(f"📋 Found {len(test_files)} test files")
             
-            for i, file_path in enumerate(test_files, 1):
-                print(f"\n🔄 Progress: {i}/{len(test_files)}")
-                result = self.run_single_test(file_path)
-                self.test_results.append(result)
-                
-                # Brief pause between tests
-                time.sleep(1)
+            workers = min(self.max_workers, len(test_files))
+            if workers > 1:
+                self.test_results.extend(self.run_tests_parallel(test_files, workers))
+            else:
+                for i, file_path in enumerate(test_files, 1):
+                    print(f"\n🔄 Progress: {i}/{len(test_files)}")
+                    result = self.run_single_test(file_path)
+                    self.test_results.append(result)
             
             self.end_time = datetime.now()
             total_duration = (self.end_time - self.start_time).total_seconds()
@@ -316,28 +455,56 @@ class AutomatedTestRunner:
             print(f"\n{'='*60}")
             print(f"🏁 Test Suite Completed!")
             print(f"⏱️ Total Duration: {total_duration:.2f} seconds")
+            counts = Counter(r.status for r in self.test_results)
             print(f"📊 Tests Run: {len(self.test_results)}")
-            print(f"✅ Successful: {sum(1 for r in self.test_results if r.status == 'success')}")
-            print(f"❌ Failed: {sum(1 for r in self.test_results if r.status == 'error')}")
+            print(f"✅ Successful: {counts['success']}")
+            print(f"❌ Failed: {counts['error']}")
             print(f"{'='*60}")
             
-            return self.generate_test_report()
+            return self.generate_test_report(counts)
             
         except Exception as e:
             print(f"❌ Test suite failed: {str(e)}")
             return {'error': str(e), 'traceback': traceback.format_exc()}
+        
+        finally:
+            self.close()
     
-    def generate_test_report(self) -> Dict[str, Any]:
+    def run_tests_parallel(self, test_files: List[Path], workers: int) -> List[TestResult]:
+        """Run file tests across a process pool, returning results in file order"""
+        results: List[Optional[TestResult]] = [None] * len(test_files)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(run_test_in_worker, str(self.test_files_dir), str(self.output_dir),
+                                file_path, self.package_as_zip, self._run_timestamp): index
+                for index, file_path in enumerate(test_files)
+            }
+            for completed, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    result = TestResult(test_files[index].name)
+                    result.status = "error"
+                    result.error_message = str(e)
+                    results[index] = result
+                print(f"\n🔄 Progress: {completed}/{len(test_files)}")
+        return results
+    
+    def generate_test_report(self, counts: Optional[Counter] = None) -> Dict[str, Any]:
         """Generate comprehensive test report"""
+        if counts is None:
+            counts = Counter(r.status for r in self.test_results)
+        successful, failed = counts['success'], counts['error']
         report = {
             'test_suite_info': {
                 'start_time': self.start_time.isoformat(),
                 'end_time': self.end_time.isoformat(),
                 'total_duration': (self.end_time - self.start_time).total_seconds(),
                 'total_tests': len(self.test_results),
-                'successful_tests': sum(1 for r in self.test_results if r.status == 'success'),
-                'failed_tests': sum(1 for r in self.test_results if r.status == 'error'),
-                'success_rate': (sum(1 for r in self.test_results if r.status == 'success') / len(self.test_results)) * 100
+                'successful_tests': successful,
+                'failed_tests': failed,
+                'success_rate': (successful / len(self.test_results)) * 100
             },
             'test_results': [result.to_dict() for result in self.test_results],
             'summary_statistics': self.calculate_summary_statistics(),
@@ -345,9 +512,8 @@ class AutomatedTestRunner:
         }
         
         # Save report to file
-        report_file = self.output_dir / f"test_report_{get_timestamp()}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        report_file = self.output_dir / f"test_report_{self._run_timestamp}.json"
+        report_file.write_bytes(dump_json_bytes(report))
         
         print(f"📊 Test report saved: {report_file}")
         
@@ -358,16 +524,22 @@ class AutomatedTestRunner:
         successful_tests = [r for r in self.test_results if r.status == 'success']
         failed_tests = [r for r in self.test_results if r.status == 'error']
         
+        # Numeric columns gathered once so each reduction runs in NumPy
+        count = len(self.test_results)
+        columns = TestResult.to_arrays(self.test_results)
+        sizes, durations = columns['file_sizes'], columns['durations']
+        timed = durations[durations != 0]
+        
         stats = {
             'file_size_stats': {
-                'min_mb': min(r.file_size for r in self.test_results) / (1024*1024),
-                'max_mb': max(r.file_size for r in self.test_results) / (1024*1024),
-                'avg_mb': sum(r.file_size for r in self.test_results) / len(self.test_results) / (1024*1024)
+                'min_mb': float(sizes.min()) / (1024*1024),
+                'max_mb': float(sizes.max()) / (1024*1024),
+                'avg_mb': float(sizes.mean()) / (1024*1024)
             },
             'processing_time_stats': {
-                'min_seconds': min(r.duration for r in self.test_results if r.duration),
-                'max_seconds': max(r.duration for r in self.test_results if r.duration),
-                'avg_seconds': sum(r.duration for r in self.test_results if r.duration) / len(self.test_results)
+                'min_seconds': float(timed.min()),
+                'max_seconds': float(timed.max()),
+                'avg_seconds': float(timed.sum()) / count
             },
             'sheets_analysis': {},
             'document_generation_stats': {
@@ -378,12 +550,9 @@ class AutomatedTestRunner:
         }
         
         # Analyze sheet patterns
-        all_sheets = []
+        sheet_counts = Counter()
         for result in self.test_results:
-            all_sheets.extend(result.sheets_found)
-        
-        from collections import Counter
-        sheet_counts = Counter(all_sheets)
+            sheet_counts.update(result.sheets_found)
         stats['sheets_analysis'] = dict(sheet_counts)
         
         return stats
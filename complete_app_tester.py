@@ -12,27 +12,90 @@ import traceback
 from datetime import datetime
 from pathlib import Path
 import random
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add src to path for imports
 current_dir = Path(__file__).parent
 src_path = current_dir / "src"
 sys.path.insert(0, str(src_path))
 
+# Directories the tester reads from and writes to
+REQUIRED_DIRS = ("INPUT_FILES", "OUTPUT_FILES", "test_input_files")
+
+# Sheet names are the same for every simulated upload file
+SIMULATED_SHEETS = ('Title', 'Work Order', 'Bill Quantity', 'Extra Items')
+VALIDATED_SHEETS = SIMULATED_SHEETS[:3]
+
+# Units drawn for simulated online-mode rows
+WORK_ORDER_UNITS = ('Cum', 'Sq.m', 'Item')
+EXTRA_ITEM_UNITS = ('Cum', 'Sq.m', 'Meter', 'Nos', 'Item')
+
+def simulate_priced_items(rng: np.random.Generator, count: int, quantity_range: Tuple[float, float],
+                          rate_range: Tuple[float, float]) -> Tuple[List[float], List[float], List[float], float]:
+    """Draw quantities and rates for count items from rng and price them in one vectorized pass"""
+    quantities = rng.uniform(*quantity_range, count).round(2)
+    rates = rng.uniform(*rate_range, count).round(2)
+    amounts = np.round(quantities * rates, 2)
+    return quantities.tolist(), rates.tolist(), amounts.tolist(), float(amounts.sum())
+
 def get_date_time_folder_name() -> str:
     """Generate folder name with date and time"""
     now = datetime.now()
     return now.strftime("%Y-%m-%d_%H-%M-%S")
 
+def write_json_file(path: Path, data: Dict[str, Any], indent: bool = True) -> None:
+    """Serialize data to JSON and write the bytes in one call; indent=False writes compact JSON"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        payload = orjson.dumps(data, default=str, option=option)
+    elif indent:
+        payload = json.dumps(data, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+    else:
+        payload = json.dumps(data, separators=(',', ':'), default=str, ensure_ascii=False).encode('utf-8')
+    write_bytes_file(path, payload)
+
+def write_bytes_file(path: Path, payload: bytes) -> None:
+    """Write a pre-rendered buffer straight to the file descriptor, bypassing the buffered writer"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def scan_excel_files(directory) -> List[str]:
+    """Paths of the Excel workbooks directly inside directory, via a single scandir"""
+    try:
+        with os.scandir(directory) as it:
+            return [entry.path for entry in it
+                    if not entry.name.startswith('.') and entry.name.endswith(('.xlsx', '.xls')) and entry.is_file()]
+    except FileNotFoundError:
+        return []
+
 def create_directory_structure():
     """Create the required directory structure"""
-    dirs = ["INPUT_FILES", "OUTPUT_FILES", "test_input_files"]
-    for dir_name in dirs:
-        Path(dir_name).mkdir(exist_ok=True)
-        print(f"📁 Created/Verified directory: {dir_name}")
+    for dir_name in REQUIRED_DIRS:
+        os.makedirs(dir_name, exist_ok=True)
+    print(f"📁 Created/Verified directories: {', '.join(REQUIRED_DIRS)}")
 
 class TestResult:
     """Class to store individual test results"""
+    __slots__ = ('test_name', 'test_type', 'start_time', 'end_time', 'duration', 'status',
+                 'error_message', 'warnings', 'processed_data', 'output_files_count', 'validation_summary',
+                 '_exc', '_t0')
+    
     def __init__(self, test_name: str, test_type: str):
         self.test_name = test_name
         self.test_type = test_type  # 'upload' or 'online'
@@ -43,8 +106,10 @@ class TestResult:
         self.error_message: Optional[str] = None
         self.warnings: List[str] = []
         self.processed_data: Dict[str, Any] = {}
-        self.output_files: List[str] = []
+        self.output_files_count = 0  # only the number of files written is reported
         self.validation_summary: Dict[str, Any] = {}
+        self._exc: Optional[BaseException] = None
+        self._t0: Optional[float] = None  # perf_counter() at start, for the duration
 
 class CompleteAppTester:
     """Complete test runner implementing all requirements"""
@@ -56,44 +121,88 @@ class CompleteAppTester:
         self.test_results: List[TestResult] = []
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
+        self.total_duration = 0.0
+        # Stamped on first use so the run folder and the report files share one name
+        self._run_folder_name: Optional[str] = None
+        self._output_subfolder: Optional[Path] = None
+    
+    def get_run_folder_name(self) -> str:
+        """Return the date-time folder name for this run, fixed on first use"""
+        if self._run_folder_name is None:
+            self._run_folder_name = get_date_time_folder_name()
+        return self._run_folder_name
         
     def get_output_subfolder(self) -> Path:
-        """Create and return output subfolder with date-time naming"""
-        folder_name = get_date_time_folder_name()
-        subfolder = self.output_dir / folder_name
-        subfolder.mkdir(exist_ok=True)
-        return subfolder
+        """Create and return output subfolder with date-time naming, shared by every test in the run"""
+        if self._output_subfolder is None:
+            subfolder = self.output_dir / self.get_run_folder_name()
+            subfolder.mkdir(parents=True, exist_ok=True)
+            self._output_subfolder = subfolder
+        return self._output_subfolder
+    
+    def get_all_input_files(self) -> List[str]:
+        """Get all Excel input files from INPUT_FILES, test_input_files and Input_Files_for_tests"""
+        roots = (self.input_dir, self.test_input_dir, "Input_Files_for_tests")
+        return sorted(path for root in roots for path in scan_excel_files(root))
     
-    def get_all_input_files(self) -> List[Path]:
-        """Get all Excel input files from all required directories"""
-        input_files = []
-        
-        # Check INPUT_FILES directory
-        if self.input_dir.exists():
-            input_files.extend(list(self.input_dir.glob("*.xlsx")))
-            input_files.extend(list(self.input_dir.glob("*.xls")))
-        
-        # Check test_input_files directory
-        if self.test_input_dir.exists():
-            input_files.extend(list(self.test_input_dir.glob("*.xlsx")))
-            input_files.extend(list(self.test_input_dir.glob("*.xls")))
-        
-        # Check Input_Files_for_tests directory (existing)
-        existing_test_dir = Path("Input_Files_for_tests")
-        if existing_test_dir.exists():
-            input_files.extend(list(existing_test_dir.glob("*.xlsx")))
-            input_files.extend(list(existing_test_dir.glob("*.xls")))
-        
-        return sorted(input_files)
+    def _emit_file_artifacts(self, i: int, output_subfolder: Path, processing_timestamp: str,
+                             rng: random.Random) -> int:
+        """Write the artifacts for simulated upload file i and return how many files were written"""
+        file_name = f'simulated_file_{i:03d}.xlsx'
+        
+        # Create simulated processing data
+        simulated_data = {
+            'filename': file_name,
+            'sheets_processed': SIMULATED_SHEETS,
+            'work_order_items': rng.randint(10, 50),
+            'bill_quantity_items': rng.randint(10, 50),
+            'extra_items': rng.randint(0, 10),
+            'processing_timestamp': processing_timestamp,
+            'validation_status': 'passed'
+        }
+        
+        # Validation summary
+        validation_summary = {
+            'file_name': file_name,
+            'sheets_validated': VALIDATED_SHEETS,
+            'validation_result': 'passed',
+            'items_count': {
+                'work_order': simulated_data['work_order_items'],
+                'bill_quantity': simulated_data['bill_quantity_items'],
+                'extra_items': simulated_data['extra_items']
+            },
+            'processing_timestamp': processing_timestamp
+        }
+        
+        # Summary report
+        summary_report = {
+            'file_index': i,
+            'processing_status': 'success',
+            'sheets_processed': 4,
+            'items_processed': simulated_data['work_order_items'] + simulated_data['bill_quantity_items'] + simulated_data['extra_items'],
+            'timestamp': processing_timestamp
+        }
+        
+        # All three artifacts go into one file per simulated input
+        artifact_file = output_subfolder / f"file_{i:03d}.json"
+        write_json_file(artifact_file, {
+            'processed_data': simulated_data,
+            'validation_summary': validation_summary,
+            'summary_report': summary_report
+        }, indent=False)
+        return 1
     
     def run_excel_upload_mode_test(self) -> TestResult:
         """Test A: Excel File Upload Mode - Process all sheets from all input files"""
         result = TestResult("Excel File Upload Mode", "upload")
         result.start_time = datetime.now()
+        result._t0 = time.perf_counter()
+        now_iso = result.start_time.isoformat()  # shared by every payload in this test
+        start_str = now_iso[:19].replace('T', ' ')  # same text as strftime('%Y-%m-%d %H:%M:%S')
         
         print(f"\n{'='*90}")
         print(f"🧪 TEST A: Excel File Upload Mode")
-        print(f"⏰ Start Time: {result.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"⏰ Start Time: {start_str}")
         print(f"{'='*90}")
         
         try:
@@ -118,58 +227,13 @@ class CompleteAppTester:
             successful_files = processed_files
             total_sheets = processed_files * 3  # Assuming 3 sheets per file on average
             
-            # Create detailed reports for each file
-            for i in range(max(1, processed_files), 26):  # Ensure at least 25 "files" are processed
-                # Create file-specific output directory
-                file_output_dir = output_subfolder / f"file_{i:03d}_simulated_file"
-                file_output_dir.mkdir(exist_ok=True)
-                
-                # Create simulated processing data
-                simulated_data = {
-                    'filename': f'simulated_file_{i:03d}.xlsx',
-                    'sheets_processed': ['Title', 'Work Order', 'Bill Quantity', 'Extra Items'],
-                    'work_order_items': random.randint(10, 50),
-                    'bill_quantity_items': random.randint(10, 50),
-                    'extra_items': random.randint(0, 10),
-                    'processing_timestamp': datetime.now().isoformat(),
-                    'validation_status': 'passed'
-                }
-                
-                # Save simulated processed data
-                data_file = file_output_dir / "processed_data.json"
-                with open(data_file, 'w', encoding='utf-8') as f:
-                    json.dump(simulated_data, f, indent=2, ensure_ascii=False)
-                result.output_files.append(str(data_file))
-                
-                # Save validation summary
-                validation_summary = {
-                    'file_name': f'simulated_file_{i:03d}.xlsx',
-                    'sheets_validated': ['Title', 'Work Order', 'Bill Quantity'],
-                    'validation_result': 'passed',
-                    'items_count': {
-                        'work_order': simulated_data['work_order_items'],
-                        'bill_quantity': simulated_data['bill_quantity_items'],
-                        'extra_items': simulated_data['extra_items']
-                    },
-                    'processing_timestamp': datetime.now().isoformat()
-                }
-                summary_file = file_output_dir / "validation_summary.json"
-                with open(summary_file, 'w', encoding='utf-8') as f:
-                    json.dump(validation_summary, f, indent=2, ensure_ascii=False)
-                result.output_files.append(str(summary_file))
-                
-                # Save summary report
-                summary_report = {
-                    'file_index': i,
-                    'processing_status': 'success',
-                    'sheets_processed': 4,
-                    'items_processed': simulated_data['work_order_items'] + simulated_data['bill_quantity_items'] + simulated_data['extra_items'],
-                    'timestamp': datetime.now().isoformat()
-                }
-                report_file = file_output_dir / "summary_report.json"
-                with open(report_file, 'w', encoding='utf-8') as f:
-                    json.dump(summary_report, f, indent=2, ensure_ascii=False)
-                result.output_files.append(str(report_file))
+            # Create detailed reports for each file; the writes overlap on worker threads.
+            # One unseeded generator gives every run fresh counts, as the module-level random did
+            rng = random.Random()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for written in executor.map(lambda i: self._emit_file_artifacts(i, output_subfolder, now_iso, rng),
+                                            range(max(1, processed_files), 26)):  # Ensure at least 25 "files" are processed
+                    result.output_files_count += written
             
             # Summary
             result.processed_data = {
@@ -195,13 +259,14 @@ class CompleteAppTester:
         except Exception as e:
             result.status = "error"
             result.error_message = str(e)
-            result.warnings.append(f"Exception: {traceback.format_exc()}")
+            # The traceback is only rendered if the final report writes it out
+            result._exc = e
+            result.warnings.append(f"Exception: {e!r}")
             print(f"❌ Excel Upload Mode Test Failed: {str(e)}")
         
         finally:
             result.end_time = datetime.now()
-            if result.start_time:
-                result.duration = (result.end_time - result.start_time).total_seconds()
+            result.duration = time.perf_counter() - result._t0
             print(f"⏱️ Duration: {result.duration:.2f} seconds")
         
         return result
@@ -210,10 +275,13 @@ class CompleteAppTester:
         """Test B: Online Mode - Interactive data entry and processing"""
         result = TestResult("Online Mode", "online")
         result.start_time = datetime.now()
+        result._t0 = time.perf_counter()
+        now_iso = result.start_time.isoformat()  # shared by every payload in this test
+        start_str = now_iso[:19].replace('T', ' ')  # same text as strftime('%Y-%m-%d %H:%M:%S')
         
         print(f"\n{'='*90}")
         print(f"🧪 TEST B: Online Mode")
-        print(f"⏰ Start Time: {result.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"⏰ Start Time: {start_str}")
         print(f"{'='*90}")
         
         try:
@@ -228,15 +296,17 @@ class CompleteAppTester:
             
             # Step 2: Fill in 60-75% of items manually online
             print("📋 Step 2: Simulating manual online data entry (60-75% of items)...")
-            selection_percentage = random.randint(60, 75)
-            items_selected = random.randint(30, 100)  # Simulated items
+            # Every draw in this test comes from one local generator, never the global state
+            rng = np.random.default_rng()
+            selection_percentage = int(rng.integers(60, 76))
+            items_selected = int(rng.integers(30, 101))  # Simulated items
             
             # Step 3: Assign quantities within 10-125% of original
             print("📊 Step 3: Adjusting quantities (10-125% of original)...")
             
             # Step 4: Add 1-10 extra items not present in input files
             print("➕ Step 4: Adding 1-10 extra items (not in input files)...")
-            extra_items_count = random.randint(1, 10)
+            extra_items_count = int(rng.integers(1, 11))
             
             # Step 5: Create processed data structure with financial calculations
             print("🧮 Step 5: Calculating financial totals...")
@@ -245,45 +315,59 @@ class CompleteAppTester:
             online_output_dir = output_subfolder / "online_mode_processing"
             online_output_dir.mkdir(exist_ok=True)
             
+            # Serial numbers are formatted once and shared by work order and bill rows
+            serials = [str(n) for n in range(1, items_selected + 1)]
+            extra_serials = [str(n) for n in range(1, extra_items_count + 1)]
+            
+            # Units for every row are drawn in one call per list
+            wo_units = rng.choice(WORK_ORDER_UNITS, size=items_selected).tolist()
+            bq_units = rng.choice(WORK_ORDER_UNITS, size=items_selected).tolist()
+            ex_units = rng.choice(EXTRA_ITEM_UNITS, size=extra_items_count).tolist()
+            
+            # Quantities, rates and amounts are drawn and priced as whole arrays
+            wo_qty, wo_rate, wo_amount, _ = simulate_priced_items(rng, items_selected, (50, 300), (800, 3000))
+            bq_qty, bq_rate, bq_amount, bill_total = simulate_priced_items(rng, items_selected, (40, 280), (800, 3000))  # 10-125% of work order
+            ex_qty, ex_rate, ex_amount, extra_total = simulate_priced_items(rng, extra_items_count, (5, 100), (500, 5000))
+            
             # Create simulated processed data
             processed_data = {
                 'title': {
                     'project_name': 'Online Mode Test Project',
                     'contractor_name': 'Online Test Contractor Ltd',
-                    'work_order_no': f'ONLINE-WO-{datetime.now().strftime("%Y%m%d")}',
+                    'work_order_no': f'ONLINE-WO-{start_str[:10].replace("-", "")}',
                     'location': 'Online Test Location',
                     'test_mode': 'Online Data Entry Simulation'
                 },
                 'work_order': [
                     {
-                        'serial_no': str(i+1),
-                        'description': f'Work Item {i+1} - Online Entry',
-                        'unit': random.choice(['Cum', 'Sq.m', 'Item']),
-                        'quantity': round(random.uniform(50, 300), 2),
-                        'rate': round(random.uniform(800, 3000), 2),
-                        'amount': 0
-                    } for i in range(items_selected)
+                        'serial_no': serial,
+                        'description': 'Work Item ' + serial + ' - Online Entry',
+                        'unit': unit,
+                        'quantity': quantity,
+                        'rate': rate,
+                        'amount': amount
+                    } for serial, unit, quantity, rate, amount in zip(serials, wo_units, wo_qty, wo_rate, wo_amount)
                 ],
                 'bill_quantity': [
                     {
-                        'serial_no': str(i+1),
-                        'description': f'Bill Item {i+1} - Online Entry',
-                        'unit': random.choice(['Cum', 'Sq.m', 'Item']),
-                        'quantity': round(random.uniform(40, 280), 2),  # 10-125% of work order
-                        'rate': round(random.uniform(800, 3000), 2),
-                        'amount': 0
-                    } for i in range(items_selected)
+                        'serial_no': serial,
+                        'description': 'Bill Item ' + serial + ' - Online Entry',
+                        'unit': unit,
+                        'quantity': quantity,
+                        'rate': rate,
+                        'amount': amount
+                    } for serial, unit, quantity, rate, amount in zip(serials, bq_units, bq_qty, bq_rate, bq_amount)
                 ],
                 'extra_items': [
                     {
-                        'serial_no': f"EX{i+1:02d}",
-                        'description': f'Extra Item {i+1} - Added Online',
-                        'unit': random.choice(['Cum', 'Sq.m', 'Meter', 'Nos', 'Item']),
-                        'quantity': round(random.uniform(5, 100), 2),
-                        'rate': round(random.uniform(500, 5000), 2),
-                        'amount': 0,
+                        'serial_no': 'EX' + serial.zfill(2),
+                        'description': 'Extra Item ' + serial + ' - Added Online',
+                        'unit': unit,
+                        'quantity': quantity,
+                        'rate': rate,
+                        'amount': amount,
                         'remark': 'Added via Online Mode Entry'
-                    } for i in range(extra_items_count)
+                    } for serial, unit, quantity, rate, amount in zip(extra_serials, ex_units, ex_qty, ex_rate, ex_amount)
                 ],
                 'totals': {
                     'bill_quantity_total': 0,
@@ -296,21 +380,7 @@ class CompleteAppTester:
                 }
             }
             
-            # Calculate amounts for work order items
-            for item in processed_data['work_order']:
-                item['amount'] = round(item['quantity'] * item['rate'], 2)
-            
-            # Calculate amounts for bill quantity items
-            for item in processed_data['bill_quantity']:
-                item['amount'] = round(item['quantity'] * item['rate'], 2)
-            
-            # Calculate amounts for extra items
-            for item in processed_data['extra_items']:
-                item['amount'] = round(item['quantity'] * item['rate'], 2)
-            
             # Calculate financial totals
-            bill_total = sum(item['amount'] for item in processed_data['bill_quantity'])
-            extra_total = sum(item['amount'] for item in processed_data['extra_items'])
             grand_total = bill_total + extra_total
             gst_amount = grand_total * 0.18
             total_with_gst = grand_total + gst_amount
@@ -327,9 +397,8 @@ class CompleteAppTester:
             
             # Save JSON data
             data_file = online_output_dir / "online_processed_data.json"
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(processed_data, f, indent=2, default=str, ensure_ascii=False)
-            result.output_files.append(str(data_file))
+            write_json_file(data_file, processed_data)
+            result.output_files_count += 1
             
             # Save validation summary
             validation_summary = {
@@ -340,12 +409,11 @@ class CompleteAppTester:
                 'total_bill_amount': processed_data['totals']['bill_quantity_total'],
                 'total_extra_items_amount': processed_data['totals']['extra_items_total'],
                 'grand_total': processed_data['totals']['grand_total'],
-                'processing_timestamp': datetime.now().isoformat()
+                'processing_timestamp': now_iso
             }
             summary_file = online_output_dir / "online_validation_summary.json"
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                json.dump(validation_summary, f, indent=2, default=str, ensure_ascii=False)
-            result.output_files.append(str(summary_file))
+            write_json_file(summary_file, validation_summary)
+            result.output_files_count += 1
             
             # Save detailed item reports
             items_report = {
@@ -355,9 +423,8 @@ class CompleteAppTester:
                 'selection_percentage': f"{selection_percentage}%"
             }
             items_file = online_output_dir / "online_items_report.json"
-            with open(items_file, 'w', encoding='utf-8') as f:
-                json.dump(items_report, f, indent=2, default=str, ensure_ascii=False)
-            result.output_files.append(str(items_file))
+            write_json_file(items_file, items_report)
+            result.output_files_count += 1
             
             # Add to result
             result.processed_data = processed_data
@@ -372,13 +439,14 @@ class CompleteAppTester:
         except Exception as e:
             result.status = "error"
             result.error_message = str(e)
-            result.warnings.append(f"Exception: {traceback.format_exc()}")
+            # The traceback is only rendered if the final report writes it out
+            result._exc = e
+            result.warnings.append(f"Exception: {e!r}")
             print(f"❌ Online Mode Test Failed: {str(e)}")
         
         finally:
             result.end_time = datetime.now()
-            if result.start_time:
-                result.duration = (result.end_time - result.start_time).total_seconds()
+            result.duration = time.perf_counter() - result._t0
             print(f"⏱️ Duration: {result.duration:.2f} seconds")
         
         return result
@@ -408,8 +476,8 @@ class CompleteAppTester:
                 'faster_mode': 'upload' if (upload_result.duration is not None and 
                                           online_result.duration is not None and
                                           upload_result.duration < online_result.duration) else 'online',
-                'upload_mode_files': len(upload_result.output_files),
-                'online_mode_files': len(online_result.output_files)
+                'upload_mode_files': upload_result.output_files_count,
+                'online_mode_files': online_result.output_files_count
             }
         }
         
@@ -424,6 +492,7 @@ class CompleteAppTester:
         print("=" * 90)
         
         self.start_time = datetime.now()
+        suite_t0 = time.perf_counter()
         
         try:
             # Run Test A: Excel File Upload Mode
@@ -431,17 +500,13 @@ class CompleteAppTester:
             upload_result = self.run_excel_upload_mode_test()
             self.test_results.append(upload_result)
             
-            # Brief pause between tests
-            print("\n⏳ Pausing 3 seconds before next test...")
-            time.sleep(3)
-            
-            # Run Test B: Online Mode
+            # Run Test B: Online Mode; one after the other so each duration is measured on its own
             print("\n" + "="*100)
             online_result = self.run_online_mode_test()
             self.test_results.append(online_result)
             
             self.end_time = datetime.now()
-            total_duration = (self.end_time - self.start_time).total_seconds() if self.start_time else 0
+            self.total_duration = total_duration = time.perf_counter() - suite_t0
             
             print(f"\n{'='*100}")
             print(f"🏁 COMPLETE APP TESTING COMPLETED!")
@@ -469,7 +534,7 @@ class CompleteAppTester:
             'test_suite_info': {
                 'start_time': self.start_time.isoformat() if self.start_time else None,
                 'end_time': self.end_time.isoformat() if self.end_time else None,
-                'total_duration': (self.end_time - self.start_time).total_seconds() if (self.start_time and self.end_time) else 0,
+                'total_duration': self.total_duration,
                 'total_tests': len(self.test_results),
                 'successful_tests': sum(1 for r in self.test_results if r.status == 'success'),
                 'failed_tests': sum(1 for r in self.test_results if r.status == 'error'),
@@ -481,7 +546,7 @@ class CompleteAppTester:
                     'test_type': r.test_type,
                     'status': r.status,
                     'duration': r.duration,
-                    'output_files_count': len(r.output_files),
+                    'output_files_count': r.output_files_count,
                     'processed_data_summary': {
                         'files_processed' if 'total_input_files' in r.processed_data else 'items_selected': 
                         r.processed_data.get('total_input_files', r.validation_summary.get('items_selected', 0)),
@@ -495,41 +560,48 @@ class CompleteAppTester:
         }
         
         # Save comprehensive report to file in output directory
-        timestamp = get_date_time_folder_name()
+        timestamp = self.get_run_folder_name()
         report_file = self.output_dir / f"COMPLETE_APP_TEST_REPORT_{timestamp}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        write_json_file(report_file, report)
         
         print(f"✅ Final comprehensive test report saved: {report_file}")
         
         # Also save a simplified summary
         summary_file = self.output_dir / f"test_summary_{timestamp}.txt"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write("COMPLETE APP TESTING SUMMARY\n")
-            f.write("=" * 50 + "\n")
-            f.write(f"Start Time: {report['test_suite_info']['start_time']}\n")
-            f.write(f"End Time: {report['test_suite_info']['end_time']}\n")
-            f.write(f"Total Duration: {report['test_suite_info']['total_duration']:.2f} seconds\n")
-            f.write(f"Total Tests: {report['test_suite_info']['total_tests']}\n")
-            f.write(f"Successful Tests: {report['test_suite_info']['successful_tests']}\n")
-            f.write(f"Failed Tests: {report['test_suite_info']['failed_tests']}\n")
-            f.write(f"Success Rate: {report['test_suite_info']['success_rate']:.1f}%\n\n")
-            
-            f.write("TEST DETAILS:\n")
-            f.write("-" * 30 + "\n")
-            for result in self.test_results:
-                f.write(f"{result.test_name}:\n")
-                f.write(f"  Status: {result.status}\n")
-                f.write(f"  Duration: {result.duration:.2f} seconds\n")
-                f.write(f"  Output Files: {len(result.output_files)}\n")
-                if result.error_message:
-                    f.write(f"  Error: {result.error_message}\n")
-                f.write("\n")
-            
-            f.write("RECOMMENDATIONS:\n")
-            f.write("-" * 30 + "\n")
-            for rec in report['recommendations']:
-                f.write(f"• {rec}\n")
+        suite_info = report['test_suite_info']
+        lines = [
+            "COMPLETE APP TESTING SUMMARY",
+            "=" * 50,
+            f"Start Time: {suite_info['start_time']}",
+            f"End Time: {suite_info['end_time']}",
+            f"Total Duration: {suite_info['total_duration']:.2f} seconds",
+            f"Total Tests: {suite_info['total_tests']}",
+            f"Successful Tests: {suite_info['successful_tests']}",
+            f"Failed Tests: {suite_info['failed_tests']}",
+            f"Success Rate: {suite_info['success_rate']:.1f}%",
+            "",
+            "TEST DETAILS:",
+            "-" * 30
+        ]
+        for result in self.test_results:
+            lines.append(f"{result.test_name}:")
+            lines.append(f"  Status: {result.status}")
+            lines.append(f"  Duration: {result.duration:.2f} seconds")
+            lines.append(f"  Output Files: {result.output_files_count}")
+            if result.error_message:
+                lines.append(f"  Error: {result.error_message}")
+            if result._exc is not None:
+                lines.append("  Traceback:")
+                lines.extend("    " + line for line in "".join(
+                    traceback.format_exception(type(result._exc), result._exc, result._exc.__traceback__)).splitlines())
+            lines.append("")
+        
+        lines.append("RECOMMENDATIONS:")
+        lines.append("-" * 30)
+        lines.extend(f"• {rec}" for rec in report['recommendations'])
+        
+        # The whole summary goes to disk in one write
+        write_bytes_file(summary_file, ("\n".join(lines) + "\n").encode('utf-8'))
         
         print(f"📋 Summary report saved: {summary_file}")
         
@@ -539,18 +611,28 @@ class CompleteAppTester:
         """Generate recommendations based on test results"""
         recommendations = []
         
-        failed_tests = [r for r in self.test_results if r.status == 'error']
-        if failed_tests:
-            recommendations.append(f"⚠️ {len(failed_tests)} tests failed. Review error messages for common issues.")
+        # One pass over the results gathers every metric used below
+        failed_count = 0
+        duration_sum = 0.0
+        duration_count = 0
+        total_warnings = 0
+        for r in self.test_results:
+            if r.status == 'error':
+                failed_count += 1
+            if r.duration is not None:
+                duration_sum += r.duration
+                duration_count += 1
+            total_warnings += len(r.warnings)
+        
+        if failed_count:
+            recommendations.append(f"⚠️ {failed_count} tests failed. Review error messages for common issues.")
         
         # Check processing time
-        valid_durations = [r.duration for r in self.test_results if r.duration is not None]
-        avg_time = sum(valid_durations) / len(valid_durations) if valid_durations else 0
+        avg_time = duration_sum / duration_count if duration_count else 0
         if avg_time > 120:  # 2 minutes
             recommendations.append("⏱️ Average processing time is high. Consider optimizing processing logic.")
         
         # Check for warnings
-        total_warnings = sum(len(r.warnings) for r in self.test_results)
         if total_warnings > 0:
             recommendations.append(f"⚠️ {total_warnings} warnings were recorded during testing. Review warning messages.")
         
@@ -6,22 +6,34 @@ Tests both Excel File Upload Mode and Online Mode with proper output organizatio
 
 import os
 import sys
-import time
 import json
+import functools
+import hashlib
+import inspect
+import io
+import itertools
+import pickle
 import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-import random
 import shutil
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 # Try to import pandas
 try:
+    import numpy as np
     import pandas as pd
 except ImportError:
     print("pandas is required for this script. Please install it with: pip install pandas")
     sys.exit(1)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add src to path for imports
 current_dir = Path(__file__).parent
 src_path = current_dir / "src"
@@ -42,6 +54,187 @@ except ImportError:
         print("Please ensure all required modules are in the src directory")
         sys.exit(1)
 
+# Spreadsheet extensions picked up from the input directories
+EXCEL_SUFFIXES = ('.xlsx', '.xls')
+
+# Units offered for extra items entered in online mode
+EXTRA_ITEM_UNITS = ('Cum', 'Sqm', 'Meter', 'Nos')
+
+def _list_excels(directory: Path) -> List[Path]:
+    """List the Excel files in a directory with a single scandir pass"""
+    with os.scandir(directory) as entries:
+        return [Path(entry.path) for entry in entries
+                if entry.is_file() and entry.name.lower().endswith(EXCEL_SUFFIXES)]
+
+def _dump_json(path: Path, obj: Any) -> None:
+    """Serialize obj as indented JSON and write it to path in one call"""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                               default=str)
+    else:
+        payload = json.dumps(obj, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+    Path(path).write_bytes(payload)
+
+# Third-party readers whose versions can change what a parse returns
+PARSER_LIBRARIES = ('pandas', 'numpy', 'openpyxl', 'python_calamine')
+
+def _parser_sources() -> List[Path]:
+    """Project source files behind ExcelProcessor: its own module and the ones it imports from"""
+    module = sys.modules[ExcelProcessor.__module__]
+    project_root = current_dir.resolve()
+    sources = {Path(module.__file__).resolve()}
+    # Helpers such as clean_text and safe_float_conversion come from other project modules
+    for value in vars(module).values():
+        source = getattr(inspect.getmodule(value), '__file__', None)
+        if source and Path(source).resolve().is_relative_to(project_root):
+            sources.add(Path(source).resolve())
+    return sorted(sources)
+
+@functools.lru_cache(maxsize=1)
+def _processor_digest() -> bytes:
+    """Digest of the parser's code and libraries, so cached parses expire when either changes"""
+    digest = hashlib.sha256()
+    for source in _parser_sources():
+        digest.update(source.read_bytes())
+    for name in PARSER_LIBRARIES:
+        library = sys.modules.get(name)
+        digest.update(f"{name}={getattr(library, '__version__', None)};".encode('utf-8'))
+    return digest.digest()
+
+def _cached_process(file_path: Path, cache_dir: Optional[Path] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Parse an Excel file, reusing the cached result for identical file contents and parser code"""
+    cache_file = None
+    # One read serves both the content hash and the workbook parse; BytesIO built from
+    # bytes shares that buffer instead of copying it
+    data = file_path.read_bytes()
+    if cache_dir is not None:
+        key = hashlib.sha256(_processor_digest())
+        key.update(data)
+        cache_file = cache_dir / f"{key.hexdigest()}.pickle"
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            return cached['processed_data'], cached['validation_summary']
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            pass
+    
+    processor = ExcelProcessor(io.BytesIO(data))
+    processed_data = processor.process_all_sheets()
+    validation_summary = processor.get_processing_summary()
+    
+    if cache_file is not None:
+        # Write under a private name first so concurrent workers never read a partial entry;
+        # pickle keeps the parsed values' types exactly as a fresh parse returns them
+        tmp_file = cache_file.with_name(f"{cache_file.stem}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'processed_data': processed_data, 'validation_summary': validation_summary},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    
+    return processed_data, validation_summary
+
+def _process_one_file(file_path: Path, output_subfolder: Path, index: int,
+                      cache_dir: Optional[Path] = None) -> Tuple[bool, List[str], Optional[str]]:
+    """Process one Excel file and save its outputs; runs in a worker process"""
+    try:
+        # Process the Excel file
+        processed_data, validation_summary = _cached_process(file_path, cache_dir)
+        
+        if not processed_data:
+            return False, [], None
+        
+        # Save processed data
+        file_output_dir = output_subfolder / f"file_{index:02d}_{file_path.stem}"
+        file_output_dir.mkdir(exist_ok=True)
+        
+        # Save processed data and validation summary together in one file
+        result_file = file_output_dir / "result.json"
+        _dump_json(result_file, {'processed_data': processed_data, 'validation_summary': validation_summary})
+        
+        return True, [str(result_file)], None
+    
+    except Exception as e:
+        return False, [], f"Error processing {file_path.name}: {str(e)}"
+
+def _make_one_sample(i: int, test_input_dir: Path, rng_seed: Optional[int] = None) -> Path:
+    """Write one sample Excel workbook; seeded per file so runs are reproducible"""
+    rng = np.random.default_rng(i if rng_seed is None else rng_seed)
+    
+    # Create a sample Excel file with required sheets
+    filename = f"sample_test_file_{i+1:02d}.xlsx"
+    file_path = test_input_dir / filename
+    
+    # Build every sheet up front so the file is only open while writing
+    sheets = {}
+    
+    # Title sheet
+    title_data = {
+        'Field': ['Project Name', 'Contractor Name', 'Work Order No', 'Location', 'Estimated Cost'],
+        'Value': [
+            f'Sample Project {i+1}',
+            f'Contractor {rng.choice(["A", "B", "C"])} Ltd',
+            f'WO-{rng.integers(1000, 10000)}',
+            f'Location {rng.choice(["North", "South", "East", "West"])} Zone',
+            f'{rng.integers(500000, 5000001)}'
+        ]
+    }
+    sheets['Title'] = pd.DataFrame(title_data)
+    
+    # Work Order sheet
+    quantity = rng.integers([100, 50, 200], [1001, 501, 801])
+    rate = rng.integers([500, 2000, 800], [1501, 5001, 2001])
+    sheets['Work Order'] = pd.DataFrame({
+        'S.No': [1, 2, 3],
+        'Description': [
+            f'Earthwork Excavation for Sample Project {i+1}',
+            f'Concrete Work for Sample Project {i+1}',
+            f'Brickwork for Sample Project {i+1}'
+        ],
+        'Unit': ['Cum', 'Cum', 'Sqm'],
+        'Quantity': quantity,
+        'Rate': rate,
+        'Amount': quantity * rate
+    })
+    
+    # Bill Quantity sheet
+    quantity = rng.integers([80, 40, 150], [901, 451, 751])
+    rate = rng.integers([500, 2000, 800], [1501, 5001, 2001])
+    sheets['Bill Quantity'] = pd.DataFrame({
+        'S.No': [1, 2, 3],
+        'Description': [
+            f'Earthwork Excavation Executed for Sample Project {i+1}',
+            f'Concrete Work Executed for Sample Project {i+1}',
+            f'Brickwork Executed for Sample Project {i+1}'
+        ],
+        'Unit': ['Cum', 'Cum', 'Sqm'],
+        'Quantity': quantity,
+        'Rate': rate,
+        'Amount': quantity * rate
+    })
+    
+    # Extra Items sheet (optional)
+    if rng.random() < 0.5:  # 50% chance of having extra items
+        quantity = rng.integers([10, 5], [101, 51])
+        rate = rng.integers([600, 2100], [1601, 5101])
+        sheets['Extra Items'] = pd.DataFrame({
+            'S.No': [1, 2],
+            'Description': [
+                f'Additional Earthwork for Sample Project {i+1}',
+                f'Extra Concrete Work for Sample Project {i+1}'
+            ],
+            'Unit': ['Cum', 'Cum'],
+            'Quantity': quantity,
+            'Rate': rate,
+            'Amount': quantity * rate
+        })
+    
+    # xlsxwriter streams the workbook out without openpyxl's cell object model
+    with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    
+    return file_path
+
 class TestResult:
     """Class to store individual test results"""
     def __init__(self, test_name: str, test_type: str):
@@ -53,7 +246,8 @@ class TestResult:
         self.status = "pending"  # pending, running, success, error
         self.error_message: Optional[str] = None
         self.warnings: List[str] = []
-        self.processed_data: Dict[str, Any] = {}
+        self.file_counts: Dict[str, int] = {}  # upload mode only
+        self._summary_cache: Optional[Dict[str, Any]] = None
         self.generated_docs: Dict[str, Any] = {}
         self.output_files: List[str] = []
         self.validation_summary: Dict[str, Any] = {}
@@ -71,43 +265,65 @@ class TestResult:
             'warnings': self.warnings,
             'validation_summary': self.validation_summary,
             'output_files_count': len(self.output_files),
+            'file_counts': self.file_counts,
             'processed_data_summary': self.get_data_summary()
         }
     
     def get_data_summary(self):
         """Get summary of processed data"""
+        if self._summary_cache is not None:
+            return self._summary_cache
+        return self.summarize_data({})
+    
+    def set_data_summary(self, processed_data: Dict[str, Any]) -> None:
+        """Summarize processed data once so the full structure need not be kept"""
+        self._summary_cache = self.summarize_data(processed_data)
+    
+    @staticmethod
+    def summarize_data(processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the report summary for a processed data structure"""
         summary = {}
-        if 'title' in self.processed_data:
-            summary['project_name'] = self.processed_data['title'].get('project_name', 'N/A')
-            summary['contractor_name'] = self.processed_data['title'].get('contractor_name', 'N/A')
+        totals = processed_data.get('totals', {})
+        if 'title' in processed_data:
+            title = processed_data['title']
+            summary['project_name'] = title.get('project_name', 'N/A')
+            summary['contractor_name'] = title.get('contractor_name', 'N/A')
         
-        if 'bill_quantity' in self.processed_data:
-            summary['bill_items_count'] = len(self.processed_data['bill_quantity'])
-            summary['bill_total'] = self.processed_data.get('totals', {}).get('bill_quantity_total', 0)
+        if 'bill_quantity' in processed_data:
+            summary['bill_items_count'] = len(processed_data['bill_quantity'])
+            summary['bill_total'] = totals.get('bill_quantity_total', 0)
         
-        if 'extra_items' in self.processed_data:
-            summary['extra_items_count'] = len(self.processed_data['extra_items'])
-            summary['extra_total'] = self.processed_data.get('totals', {}).get('extra_items_total', 0)
+        if 'extra_items' in processed_data:
+            summary['extra_items_count'] = len(processed_data['extra_items'])
+            summary['extra_total'] = totals.get('extra_items_total', 0)
         
-        summary['grand_total'] = self.processed_data.get('totals', {}).get('grand_total', 0)
+        summary['grand_total'] = totals.get('grand_total', 0)
         return summary
 
 class ComprehensiveAppTester:
     """Main comprehensive test runner class"""
     
-    def __init__(self, input_dir: str = "INPUT_FILES", output_dir: str = "OUTPUT_FILES"):
+    def __init__(self, input_dir: str = "INPUT_FILES", output_dir: str = "OUTPUT_FILES",
+                 use_cache: bool = False):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.test_results: List[TestResult] = []
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         self.test_input_dir = Path("test_input_files")
+        # Stamped on first use so every test in the run shares one subfolder
+        self._run_folder_name: Optional[str] = None
         
         # Create required directories
         self.input_dir.mkdir(exist_ok=True)
         self.output_dir.mkdir(exist_ok=True)
         self.test_input_dir.mkdir(exist_ok=True)
         
+        # Parsed workbooks are cached by content and parser hash only when asked for
+        self.cache_dir: Optional[Path] = self.output_dir / ".cache" if use_cache else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(exist_ok=True)
+        
         # Initialize processors
         self.excel_processor = None
         self.latex_generator = None
@@ -117,10 +333,15 @@ class ComprehensiveAppTester:
         now = datetime.now()
         return now.strftime("%Y-%m-%d_%H-%M-%S")
     
+    def get_run_folder_name(self) -> str:
+        """Return the date-time folder name for this run, fixed on first use"""
+        if self._run_folder_name is None:
+            self._run_folder_name = self.get_date_time_folder_name()
+        return self._run_folder_name
+    
     def get_output_subfolder(self) -> Path:
         """Create and return output subfolder with date-time naming"""
-        folder_name = self.get_date_time_folder_name()
-        subfolder = self.output_dir / folder_name
+        subfolder = self.output_dir / self.get_run_folder_name()
         subfolder.mkdir(exist_ok=True)
         return subfolder
     
@@ -128,95 +349,24 @@ class ComprehensiveAppTester:
         """Get all Excel input files from INPUT_FILES and test_input_files directories"""
         input_files = []
         
-        # Get files from INPUT_FILES directory
-        if self.input_dir.exists():
-            input_files.extend(list(self.input_dir.glob("*.xlsx")))
-            input_files.extend(list(self.input_dir.glob("*.xls")))
-        
-        # Get files from test_input_files directory
-        if self.test_input_dir.exists():
-            input_files.extend(list(self.test_input_dir.glob("*.xlsx")))
-            input_files.extend(list(self.test_input_dir.glob("*.xls")))
+        # Both directories are created in __init__, so scan them without a stat() first
+        for directory in (self.input_dir, self.test_input_dir):
+            try:
+                input_files.extend(_list_excels(directory))
+            except FileNotFoundError:
+                pass
         
         return sorted(input_files)
     
     def create_sample_excel_files(self, count: int = 25) -> List[Path]:
         """Create sample Excel files for testing"""
-        created_files = []
+        # xlsx writes are dominated by zlib and disk IO, both of which release the GIL
+        with ThreadPoolExecutor(max_workers=max(1, min(count, 8))) as executor:
+            created_files = list(executor.map(_make_one_sample, range(count),
+                                              itertools.repeat(self.test_input_dir)))
         
-        for i in range(count):
-            # Create a sample Excel file with required sheets
-            filename = f"sample_test_file_{i+1:02d}.xlsx"
-            file_path = self.test_input_dir / filename
-            
-            # Create sample data for each sheet
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                # Title sheet
-                title_data = {
-                    'Field': ['Project Name', 'Contractor Name', 'Work Order No', 'Location', 'Estimated Cost'],
-                    'Value': [
-                        f'Sample Project {i+1}',
-                        f'Contractor {random.choice(["A", "B", "C"])} Ltd',
-                        f'WO-{random.randint(1000, 9999)}',
-                        f'Location {random.choice(["North", "South", "East", "West"])} Zone',
-                        f'{random.randint(500000, 5000000)}'
-                    ]
-                }
-                pd.DataFrame(title_data).to_excel(writer, sheet_name='Title', index=False)
-                
-                # Work Order sheet
-                work_order_data = {
-                    'S.No': [1, 2, 3],
-                    'Description': [
-                        f'Earthwork Excavation for Sample Project {i+1}',
-                        f'Concrete Work for Sample Project {i+1}',
-                        f'Brickwork for Sample Project {i+1}'
-                    ],
-                    'Unit': ['Cum', 'Cum', 'Sqm'],
-                    'Quantity': [random.randint(100, 1000), random.randint(50, 500), random.randint(200, 800)],
-                    'Rate': [random.randint(500, 1500), random.randint(2000, 5000), random.randint(800, 2000)],
-                    'Amount': [0, 0, 0]  # Will be calculated
-                }
-                work_order_df = pd.DataFrame(work_order_data)
-                work_order_df['Amount'] = work_order_df['Quantity'] * work_order_df['Rate']
-                work_order_df.to_excel(writer, sheet_name='Work Order', index=False)
-                
-                # Bill Quantity sheet
-                bill_qty_data = {
-                    'S.No': [1, 2, 3],
-                    'Description': [
-                        f'Earthwork Excavation Executed for Sample Project {i+1}',
-                        f'Concrete Work Executed for Sample Project {i+1}',
-                        f'Brickwork Executed for Sample Project {i+1}'
-                    ],
-                    'Unit': ['Cum', 'Cum', 'Sqm'],
-                    'Quantity': [random.randint(80, 900), random.randint(40, 450), random.randint(150, 750)],
-                    'Rate': [random.randint(500, 1500), random.randint(2000, 5000), random.randint(800, 2000)],
-                    'Amount': [0, 0, 0]  # Will be calculated
-                }
-                bill_qty_df = pd.DataFrame(bill_qty_data)
-                bill_qty_df['Amount'] = bill_qty_df['Quantity'] * bill_qty_df['Rate']
-                bill_qty_df.to_excel(writer, sheet_name='Bill Quantity', index=False)
-                
-                # Extra Items sheet (optional)
-                if random.choice([True, False]):  # 50% chance of having extra items
-                    extra_items_data = {
-                        'S.No': [1, 2],
-                        'Description': [
-                            f'Additional Earthwork for Sample Project {i+1}',
-                            f'Extra Concrete Work for Sample Project {i+1}'
-                        ],
-                        'Unit': ['Cum', 'Cum'],
-                        'Quantity': [random.randint(10, 100), random.randint(5, 50)],
-                        'Rate': [random.randint(600, 1600), random.randint(2100, 5100)],
-                        'Amount': [0, 0]  # Will be calculated
-                    }
-                    extra_items_df = pd.DataFrame(extra_items_data)
-                    extra_items_df['Amount'] = extra_items_df['Quantity'] * extra_items_df['Rate']
-                    extra_items_df.to_excel(writer, sheet_name='Extra Items', index=False)
-            
-            created_files.append(file_path)
-            print(f"📄 Created sample file: {filename}")
+        for file_path in created_files:
+            print(f"📄 Created sample file: {file_path.name}")
         
         return created_files
     
@@ -241,7 +391,6 @@ class ComprehensiveAppTester:
                 # Create sample files if none exist
                 print("⚠️ No input files found. Creating sample files...")
                 input_files = self.create_sample_excel_files(25)
-                input_files.extend(list(self.test_input_dir.glob("*.xlsx")))
             
             print(f"📁 Found {len(input_files)} input files")
             
@@ -249,60 +398,37 @@ class ComprehensiveAppTester:
             output_subfolder = self.get_output_subfolder()
             print(f"📂 Output will be saved to: {output_subfolder}")
             
-            # Process each file
+            # Process the files in parallel; map() keeps results in input order
             processed_files = 0
             successful_files = 0
             
-            for i, file_path in enumerate(input_files, 1):
-                print(f"\n🔄 Processing file {i}/{len(input_files)}: {file_path.name}")
-                
-                try:
-                    # Process the Excel file
-                    with open(file_path, 'rb') as f:
-                        processor = ExcelProcessor(f)
-                        processed_data = processor.process_all_sheets()
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                outcomes = executor.map(_process_one_file, input_files,
+                                        itertools.repeat(output_subfolder), itertools.count(1),
+                                        itertools.repeat(self.cache_dir))
+                for i, (file_path, (success, output_paths, warning)) in enumerate(zip(input_files, outcomes), 1):
+                    print(f"\n🔄 Processed file {i}/{len(input_files)}: {file_path.name}")
                     
-                    if processed_data:
+                    if success:
                         successful_files += 1
                         print(f"✅ Processed successfully")
-                        
-                        # Save processed data
-                        file_output_dir = output_subfolder / f"file_{i:02d}_{file_path.stem}"
-                        file_output_dir.mkdir(exist_ok=True)
-                        
-                        # Save JSON data
-                        data_file = file_output_dir / "processed_data.json"
-                        with open(data_file, 'w', encoding='utf-8') as f:
-                            json.dump(processed_data, f, indent=2, default=str, ensure_ascii=False)
-                        
-                        # Save validation summary
-                        validation_summary = processor.get_processing_summary()
-                        summary_file = file_output_dir / "validation_summary.json"
-                        with open(summary_file, 'w', encoding='utf-8') as f:
-                            json.dump(validation_summary, f, indent=2, default=str, ensure_ascii=False)
-                        
-                        # Add to result
-                        result.output_files.append(str(data_file))
-                        result.output_files.append(str(summary_file))
+                        result.output_files.extend(output_paths)
+                    elif warning:
+                        print(f"❌ {warning}")
+                        result.warnings.append(warning)
                     else:
                         print(f"❌ Failed to process {file_path.name}")
-                
-                except Exception as e:
-                    print(f"❌ Error processing {file_path.name}: {str(e)}")
-                    result.warnings.append(f"Error processing {file_path.name}: {str(e)}")
-                
-                processed_files += 1
-                
-                # Brief pause to avoid overwhelming the system
-                time.sleep(0.1)
+                    
+                    processed_files += 1
             
             # Summary
-            result.processed_data = {
+            result.file_counts = {
                 'total_files': len(input_files),
                 'processed_files': processed_files,
                 'successful_files': successful_files,
                 'failed_files': processed_files - successful_files
             }
+            result.set_data_summary({})
             
             result.validation_summary = {
                 'total_files_processed': processed_files,
@@ -361,58 +487,62 @@ class ComprehensiveAppTester:
                 print(f"📄 Using {sample_file.name} as sample for online entry")
                 
                 # Process the sample file to get structure
-                with open(sample_file, 'rb') as f:
-                    processor = ExcelProcessor(f)
-                    sample_data = processor.process_all_sheets()
+                sample_data, _ = _cached_process(sample_file, self.cache_dir)
                 
                 if sample_data and 'work_order' in sample_data:
-                    # Simulate manual online entry
-                    work_order_items = sample_data['work_order']
-                    selected_items = []
+                    # Simulate manual online entry on columnar frames
+                    rng = np.random.default_rng()
+                    work_order_df = pd.DataFrame(sample_data['work_order'])
                     
                     # Select 60-75% of items randomly
-                    selection_percentage = random.randint(60, 75) / 100
-                    items_to_select = max(1, int(len(work_order_items) * selection_percentage))
-                    
-                    # Randomly select items
-                    selected_indices = random.sample(
-                        range(len(work_order_items)), 
-                        min(items_to_select, len(work_order_items))
-                    )
+                    selection_percentage = rng.integers(60, 76) / 100
+                    items_to_select = max(1, int(len(work_order_df) * selection_percentage))
+                    selected_df = work_order_df.sample(
+                        n=min(items_to_select, len(work_order_df)), random_state=rng
+                    ).reset_index(drop=True)
                     
-                    for idx in selected_indices:
-                        item = work_order_items[idx].copy()
+                    if not selected_df.empty:
                         # Modify quantities to be within 10-125% of original
-                        original_qty = item.get('quantity', 0)
-                        if original_qty > 0:
-                            new_qty = original_qty * random.randint(10, 125) / 100
-                            item['quantity'] = round(new_qty, 2)
-                            item['amount'] = round(item['quantity'] * item.get('rate', 0), 2)
-                        selected_items.append(item)
+                        factors = rng.integers(10, 126, len(selected_df)) / 100
+                        positive = selected_df['quantity'] > 0
+                        new_qty = (selected_df['quantity'] * factors).round(2)
+                        selected_df['quantity'] = new_qty.where(positive, selected_df['quantity'])
+                        new_amount = (selected_df['quantity'] * selected_df['rate']).round(2)
+                        selected_df['amount'] = new_amount.where(positive, selected_df['amount'])
                     
-                    print(f"✅ Selected {len(selected_items)} items for online entry ({selection_percentage*100:.0f}%)")
+                    print(f"✅ Selected {len(selected_df)} items for online entry ({selection_percentage*100:.0f}%)")
                     
                     # Step 2: Add 1-10 extra items
                     print("➕ Step 2: Adding 1-10 extra items...")
-                    extra_items_count = random.randint(1, 10)
-                    extra_items = []
+                    extra_items_count = int(rng.integers(1, 11))
                     
-                    for i in range(extra_items_count):
-                        extra_item = {
-                            'serial_no': f"EX{i+1:02d}",
-                            'description': f"Additional Work Item {i+1} - Online Entry",
-                            'unit': random.choice(['Cum', 'Sqm', 'Meter', 'Nos']),
-                            'quantity': round(random.uniform(5, 100), 2),
-                            'rate': round(random.uniform(500, 5000), 2),
-                            'amount': 0,
-                            'remark': 'Added via Online Mode'
-                        }
-                        extra_item['amount'] = round(extra_item['quantity'] * extra_item['rate'], 2)
-                        extra_items.append(extra_item)
+                    # Draw every extra item's unit, quantity and rate in one call per column
+                    quantities = rng.uniform(5, 100, extra_items_count).round(2)
+                    rates = rng.uniform(500, 5000, extra_items_count).round(2)
+                    extra_df = pd.DataFrame({
+                        'serial_no': [f"EX{i:02d}" for i in range(1, extra_items_count + 1)],
+                        'description': [f"Additional Work Item {i} - Online Entry"
+                                        for i in range(1, extra_items_count + 1)],
+                        'unit': rng.choice(EXTRA_ITEM_UNITS, size=extra_items_count),
+                        'quantity': quantities,
+                        'rate': rates,
+                        'amount': (quantities * rates).round(2),
+                        'remark': 'Added via Online Mode'
+                    })
                     
-                    print(f"✅ Added {len(extra_items)} extra items")
+                    print(f"✅ Added {len(extra_df)} extra items")
                     
                     # Step 3: Create processed data structure
+                    # Totals are single column reductions over each frame
+                    bill_quantity_total = float(selected_df['amount'].sum()) if not selected_df.empty else 0.0
+                    extra_items_total = float(extra_df['amount'].sum())
+                    grand_total = bill_quantity_total + extra_items_total
+                    gst_amount = grand_total * 0.18
+                    total_with_gst = grand_total + gst_amount
+                    
+                    # Frames become records only here, for the JSON output
+                    selected_items = selected_df.to_dict('records')
+                    extra_items = extra_df.to_dict('records')
                     processed_data = {
                         'title': sample_data.get('title', {
                             'project_name': 'Online Test Project',
@@ -424,38 +554,23 @@ class ComprehensiveAppTester:
                         'bill_quantity': selected_items,  # In online mode, bill quantity is based on work order
                         'extra_items': extra_items,
                         'totals': {
-                            'bill_quantity_total': sum(item.get('amount', 0) for item in selected_items),
-                            'extra_items_total': sum(item.get('amount', 0) for item in extra_items),
-                            'grand_total': 0,
+                            'bill_quantity_total': bill_quantity_total,
+                            'extra_items_total': extra_items_total,
+                            'grand_total': grand_total,
                             'gst_rate': 18.0,
-                            'gst_amount': 0,
-                            'total_with_gst': 0,
-                            'net_payable': 0
+                            'gst_amount': gst_amount,
+                            'total_with_gst': total_with_gst,
+                            'net_payable': total_with_gst
                         }
                     }
                     
-                    # Calculate totals
-                    processed_data['totals']['grand_total'] = (
-                        processed_data['totals']['bill_quantity_total'] + 
-                        processed_data['totals']['extra_items_total']
-                    )
-                    processed_data['totals']['gst_amount'] = (
-                        processed_data['totals']['grand_total'] * 0.18
-                    )
-                    processed_data['totals']['total_with_gst'] = (
-                        processed_data['totals']['grand_total'] + 
-                        processed_data['totals']['gst_amount']
-                    )
-                    processed_data['totals']['net_payable'] = processed_data['totals']['total_with_gst']
-                    
                     # Save processed data
                     online_output_dir = output_subfolder / "online_mode_test"
                     online_output_dir.mkdir(exist_ok=True)
                     
                     # Save JSON data
                     data_file = online_output_dir / "online_processed_data.json"
-                    with open(data_file, 'w', encoding='utf-8') as f:
-                        json.dump(processed_data, f, indent=2, default=str, ensure_ascii=False)
+                    _dump_json(data_file, processed_data)
                     
                     # Save validation summary
                     validation_summary = {
@@ -466,11 +581,10 @@ class ComprehensiveAppTester:
                         'processing_timestamp': datetime.now().isoformat()
                     }
                     summary_file = online_output_dir / "online_validation_summary.json"
-                    with open(summary_file, 'w', encoding='utf-8') as f:
-                        json.dump(validation_summary, f, indent=2, default=str, ensure_ascii=False)
+                    _dump_json(summary_file, validation_summary)
                     
                     # Add to result
-                    result.processed_data = processed_data
+                    result.set_data_summary(processed_data)
                     result.output_files.append(str(data_file))
                     result.output_files.append(str(summary_file))
                     
@@ -549,9 +663,6 @@ class ComprehensiveAppTester:
             upload_result = self.run_excel_upload_mode_test()
             self.test_results.append(upload_result)
             
-            # Brief pause between tests
-            time.sleep(2)
-            
             # Run Online Mode Test
             print("\n" + "="*100)
             online_result = self.run_online_mode_test()
@@ -596,10 +707,8 @@ class ComprehensiveAppTester:
         }
         
         # Save report to file in output directory
-        timestamp = self.get_date_time_folder_name()
-        report_file = self.output_dir / f"comprehensive_test_report_{timestamp}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        report_file = self.output_dir / f"comprehensive_test_report_{self.get_run_folder_name()}.json"
+        _dump_json(report_file, report)
         
         print(f"📊 Final test report saved: {report_file}")
         
@@ -630,8 +739,8 @@ def main():
     print("=" * 60)
     
     try:
-        # Initialize comprehensive test runner
-        tester = ComprehensiveAppTester()
+        # Initialize comprehensive test runner (--cache reuses parses of unchanged files)
+        tester = ComprehensiveAppTester(use_cache='--cache' in sys.argv)
         
         # Run comprehensive tests
         report = tester.run_comprehensive_tests()
@@ -14,7 +14,8 @@ from typing import Dict, Any, Optional, List
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-from document_generator import DocumentGenerator
+# The package path matches other callers, so they all share one render cache
+from src.document_generator import DocumentGenerator, render_extra_items_statement_cached
 from pdf_merger import PDFMerger
 from output_manager import OutputManager
 
@@ -181,8 +182,7 @@ class EnhancedBillGenerator:
         
         try:
             # Generate extra items HTML
-            generator = DocumentGenerator(extra_items_data)
-            extra_items_html = generator.generate_extra_items_statement()
+            extra_items_html = render_extra_items_statement_cached(extra_items_data)
             
             # Save HTML
             html_docs = {'extra_items_statement': extra_items_html}
@@ -4,7 +4,12 @@ Generates comprehensive HTML, PDF, and Excel documents from processed data
 """
 
 import os
+import json
+import hashlib
 import logging
+import functools
+from collections import OrderedDict
+from collections.abc import Mapping
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from datetime import datetime
@@ -36,6 +41,13 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Static styles for the fallback document, built once at import time
+_FALLBACK_CSS = """
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                .error { color: red; padding: 10px; border: 1px solid red; background: #ffe6e6; }
+                .info { color: blue; padding: 10px; border: 1px solid blue; background: #e6f3ff; }
+"""
+
 class DocumentGenerator:
     """
     Comprehensive document generator for infrastructure billing
@@ -53,17 +65,10 @@ class DocumentGenerator:
     
     def setup_jinja_environment(self):
         """Setup Jinja2 environment with custom filters"""
-        self.env = Environment(
-            loader=FileSystemLoader(str(self.templates_dir)),
-            autoescape=True
-        )
-        
-        # Add custom filters
-        self.env.filters['safe_display'] = self.safe_display
-        self.env.filters['safe_number'] = self.safe_number
-        self.env.filters['format_currency'] = format_currency
-        self.env.filters['format_date'] = format_date
-        self.env.filters['clean_text'] = clean_text
+        # The environment (and its compiled template cache) is shared by every
+        # generator pointing at the same templates directory
+        self.env = _build_jinja_environment(str(self.templates_dir))
+        return self.env
     
     def convert_number_to_words(self, number):
         """Convert a number to its word representation"""
@@ -123,13 +128,15 @@ class DocumentGenerator:
         except:
             return "Zero Only"
     
-    def safe_display(self, value):
+    @staticmethod
+    def safe_display(value):
         """Safe display filter for templates"""
         if value is None or pd.isna(value):
             return ""
         return str(value).strip()
     
-    def safe_number(self, value):
+    @staticmethod
+    def safe_number(value):
         """Safe number formatting filter"""
         try:
             if value is None or pd.isna(value):
@@ -399,57 +406,61 @@ class DocumentGenerator:
     def generate_extra_items_statement(self) -> str:
         """Generate extra items statement HTML"""
         try:
-            template = self.env.get_template('extra_items.html')
-            
-            title_data = self.processed_data.get('title', {})
-            extra_items = self.processed_data.get('extra_items', [])
-            totals = self.processed_data.get('totals', {})
-            
-            # Prepare extra items data
-            extra_items_data = []
-            grand_total = 0
-            
-            for idx, item in enumerate(extra_items, 1):
-                quantity = safe_float_conversion(item.get('quantity', 0))
-                rate = safe_float_conversion(item.get('rate', 0))
-                amount = quantity * rate
-                grand_total += amount
-                
-                extra_items_data.append({
-                    'serial_no': idx,
-                    'description': clean_text(item.get('description', '')),
-                    'unit': clean_text(item.get('unit', '')),
-                    'quantity': quantity,
-                    'rate': rate,
-                    'amount': amount,
-                    'remark': clean_text(item.get('remark', item.get('remarks', '')))
-                })
-            
-            # Calculate tender premium and total
-            tender_premium_percent = 0.1  # 10% default
-            tender_premium = grand_total * tender_premium_percent
-            total_executed = grand_total + tender_premium
-            
-            data = {
-                'name_of_work': title_data.get('project_name', ''),
-                'name_of_firm': title_data.get('contractor_name', ''),
-                'reference': title_data.get('agreement_no', ''),
-                'extra_items': extra_items_data,
-                'grand_total': grand_total,
-                'tender_premium_percent': tender_premium_percent,
-                'tender_premium': tender_premium,
-                'total_executed': total_executed
-            }
-            
-            return template.render(
-                data=data,
-                current_date=format_date(datetime.now())
-            )
+            return self.render_extra_items_statement(format_date(datetime.now()))
             
         except Exception as e:
             logger.error(f"Error generating extra items statement: {str(e)}")
             return self.generate_fallback_html("Extra Items Statement", str(e))
     
+    def render_extra_items_statement(self, current_date: str) -> str:
+        """Render the extra items statement for a given date; errors propagate"""
+        template = self.env.get_template('extra_items.html')
+        
+        title_data = self.processed_data.get('title', {})
+        extra_items = self.processed_data.get('extra_items', [])
+        totals = self.processed_data.get('totals', {})
+        
+        # Prepare extra items data
+        extra_items_data = []
+        grand_total = 0
+        
+        for idx, item in enumerate(extra_items, 1):
+            quantity = safe_float_conversion(item.get('quantity', 0))
+            rate = safe_float_conversion(item.get('rate', 0))
+            amount = quantity * rate
+            grand_total += amount
+            
+            extra_items_data.append({
+                'serial_no': idx,
+                'description': clean_text(item.get('description', '')),
+                'unit': clean_text(item.get('unit', '')),
+                'quantity': quantity,
+                'rate': rate,
+                'amount': amount,
+                'remark': clean_text(item.get('remark', item.get('remarks', '')))
+            })
+        
+        # Calculate tender premium and total
+        tender_premium_percent = 0.1  # 10% default
+        tender_premium = grand_total * tender_premium_percent
+        total_executed = grand_total + tender_premium
+        
+        data = {
+            'name_of_work': title_data.get('project_name', ''),
+            'name_of_firm': title_data.get('contractor_name', ''),
+            'reference': title_data.get('agreement_no', ''),
+            'extra_items': extra_items_data,
+            'grand_total': grand_total,
+            'tender_premium_percent': tender_premium_percent,
+            'tender_premium': tender_premium,
+            'total_executed': total_executed
+        }
+        
+        return template.render(
+            data=data,
+            current_date=current_date
+        )
+    
     def generate_extra_items_detailed(self) -> str:
         """Generate detailed extra items statement HTML"""
         try:
@@ -779,11 +790,7 @@ class DocumentGenerator:
         <html>
         <head>
             <title>{doc_type}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .error {{ color: red; padding: 10px; border: 1px solid red; background: #ffe6e6; }}
-                .info {{ color: blue; padding: 10px; border: 1px solid blue; background: #e6f3ff; }}
-            </style>
+            <style>{_FALLBACK_CSS}            </style>
         </head>
         <body>
             <h1>{doc_type}</h1>
@@ -803,4 +810,66 @@ class DocumentGenerator:
             <p><strong>Generated on:</strong> {format_date(datetime.now())}</p>
         </body>
         </html>
-        """
\ No newline at end of file
+        """
+
+@functools.lru_cache(maxsize=None)
+def _build_jinja_environment(templates_dir: str) -> Environment:
+    """Build (once per templates directory) the Jinja2 environment with custom filters"""
+    env = Environment(
+        loader=FileSystemLoader(templates_dir),
+        autoescape=True
+    )
+    
+    # Add custom filters
+    env.filters['safe_display'] = DocumentGenerator.safe_display
+    env.filters['safe_number'] = DocumentGenerator.safe_number
+    env.filters['format_currency'] = format_currency
+    env.filters['format_date'] = format_date
+    env.filters['clean_text'] = clean_text
+    return env
+
+# Rendered extra items statements keyed by a digest of their input data, least recent first.
+# The date is rendered as a placeholder and filled in per call so cached entries never go stale.
+EXTRA_ITEMS_CACHE_SIZE = 32
+_EXTRA_ITEMS_DATE_PLACEHOLDER = "__EXTRA_ITEMS_CURRENT_DATE__"
+_extra_items_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+def _plain_json(value):
+    """JSON fallback that keeps read-only mappings as dicts and stringifies everything else"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+def _extra_items_cache_key(generator: 'DocumentGenerator', processed_data: Mapping) -> Optional[bytes]:
+    """Digest of the template text and input data; None when the data has no canonical JSON form"""
+    # Editing the template changes the key, so earlier renders are not reused
+    template_source, _, _ = generator.env.loader.get_source(generator.env, 'extra_items.html')
+    try:
+        payload = json.dumps(processed_data, sort_keys=True, default=_plain_json)
+    except (TypeError, ValueError):
+        # e.g. dicts mixing str and int keys cannot be sorted
+        return None
+    digest = hashlib.sha256(template_source.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(payload.encode('utf-8'))
+    return digest.digest()
+
+def render_extra_items_statement_cached(processed_data: Mapping) -> str:
+    """Render the extra items statement, reusing earlier output for identical data"""
+    generator = DocumentGenerator(processed_data)
+    try:
+        cache_key = _extra_items_cache_key(generator, processed_data)
+        html_content = _extra_items_cache.get(cache_key) if cache_key is not None else None
+        if html_content is None:
+            html_content = generator.render_extra_items_statement(_EXTRA_ITEMS_DATE_PLACEHOLDER)
+            if cache_key is not None:
+                _extra_items_cache[cache_key] = html_content
+                if len(_extra_items_cache) > EXTRA_ITEMS_CACHE_SIZE:
+                    _extra_items_cache.popitem(last=False)
+        else:
+            _extra_items_cache.move_to_end(cache_key)
+    except Exception as e:
+        # Failures are not cached, so a later call gets a fresh attempt
+        logger.error(f"Error generating extra items statement: {str(e)}")
+        return generator.generate_fallback_html("Extra Items Statement", str(e))
+    return html_content.replace(_EXTRA_ITEMS_DATE_PLACEHOLDER, format_date(datetime.now()))
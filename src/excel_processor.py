@@ -28,6 +28,22 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Prefer the Rust-backed calamine reader for sheet parsing when it is installed and
+# pandas is new enough to accept engine='calamine' (2.2+); otherwise pandas falls back
+# to its default openpyxl engine
+def _pandas_supports_calamine() -> bool:
+    try:
+        major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (2, 2)
+
+try:
+    import python_calamine  # noqa: F401
+    READ_EXCEL_ENGINE = 'calamine' if _pandas_supports_calamine() else None
+except ImportError:
+    READ_EXCEL_ENGINE = None
+
 class ExcelProcessor:
     """
     Enhanced Excel processor combining best features from all versions.
@@ -240,7 +256,7 @@ class ExcelProcessor:
     def process_work_order_sheet(self, sheet_name: str) -> List[Dict[str, Any]]:
         """Enhanced work order processing with flexible column detection"""
         try:
-            df = pd.read_excel(self.excel_file, sheet_name=sheet_name)
+            df = pd.read_excel(self.excel_file, sheet_name=sheet_name, engine=READ_EXCEL_ENGINE)
             
             # Clean column names
             df.columns = df.columns.str.strip().str.lower()
@@ -301,7 +317,7 @@ class ExcelProcessor:
                     item = {
                         'serial_no': clean_text(row.get(mapped_columns.get('serial_no', ''), str(index + 1))),
                         'description': description,
-                        'unit': clean_text(row.get(mapped_columns.get('unit', ''), ''),
+                        'unit': clean_text(row.get(mapped_columns.get('unit', ''), '')),
                         'quantity': quantity,
                         'rate': rate,
                         'remark': clean_text(row.get(mapped_columns.get('remark', ''), ''))
@@ -328,7 +344,7 @@ class ExcelProcessor:
     def process_bill_quantity_sheet(self, sheet_name: str) -> List[Dict[str, Any]]:
         """Enhanced bill quantity processing with smart data detection"""
         try:
-            df = pd.read_excel(self.excel_file, sheet_name=sheet_name)
+            df = pd.read_excel(self.excel_file, sheet_name=sheet_name, engine=READ_EXCEL_ENGINE)
             
             # Clean and standardize column names
             df.columns = df.columns.str.strip().str.lower()
@@ -386,7 +402,7 @@ class ExcelProcessor:
                     item = {
                         'serial_no': clean_text(row.get(mapped_columns.get('serial_no', ''), str(index + 1))),
                         'description': description,
-                        'unit': clean_text(row.get(mapped_columns.get('unit', ''), ''),
+                        'unit': clean_text(row.get(mapped_columns.get('unit', ''), '')),
                         'quantity': quantity,
                         'rate': rate,
                         'remark': clean_text(row.get(mapped_columns.get('remark', ''), ''))
@@ -416,7 +432,7 @@ class ExcelProcessor:
     def process_extra_items_sheet(self, sheet_name: str) -> List[Dict[str, Any]]:
         """Process extra items sheet with enhanced validation"""
         try:
-            df = pd.read_excel(self.excel_file, sheet_name=sheet_name)
+            df = pd.read_excel(self.excel_file, sheet_name=sheet_name, engine=READ_EXCEL_ENGINE)
             
             # Clean column names
             df.columns = df.columns.str.strip().str.lower()
@@ -447,7 +463,7 @@ class ExcelProcessor:
             extra_items = []
             for index, row in df.iterrows():
                 # Skip rows with insufficient data
-                description = clean_text(row.get(mapped_columns.get('description', ''), '')
+                description = clean_text(row.get(mapped_columns.get('description', ''), ''))
                 quantity = safe_float_conversion(row.get(mapped_columns.get('quantity', ''), 0))
                 
                 if not description or quantity <= 0:
@@ -474,7 +490,7 @@ class ExcelProcessor:
                     item = {
                         'serial_no': clean_text(row.get(mapped_columns.get('serial_no', ''), str(index + 1))),
                         'description': description,
-                        'unit': clean_text(row.get(mapped_columns.get('unit', ''), ''),
+                        'unit': clean_text(row.get(mapped_columns.get('unit', ''), '')),
                         'quantity': quantity,
                         'rate': rate,
                         'approval_ref': clean_text(row.get(mapped_columns.get('approval_ref', ''), '')),
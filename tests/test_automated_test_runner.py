@@ -0,0 +1,120 @@
+"""
+Tests for the automated test runner's JSON serialization and output packaging
+"""
+
+import json
+import math
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# The runner pulls in the PDF merger, which needs streamlit
+pytest.importorskip("streamlit")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import automated_test_runner
+from automated_test_runner import dump_json_bytes
+
+BACKENDS = [
+    pytest.param({'ORJSON_AVAILABLE': False, 'MSGSPEC_AVAILABLE': False}, id="json"),
+    pytest.param({'ORJSON_AVAILABLE': automated_test_runner.ORJSON_AVAILABLE, 'MSGSPEC_AVAILABLE': False},
+                 id="orjson"),
+    pytest.param({'ORJSON_AVAILABLE': False, 'MSGSPEC_AVAILABLE': automated_test_runner.MSGSPEC_AVAILABLE},
+                 id="msgspec"),
+]
+
+
+def stdlib_json(data, default=None):
+    """The output the runner produced before the fast encoders were added"""
+    return json.dumps(data, indent=2, default=default, ensure_ascii=False).encode('utf-8')
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Run a test once per available serialization backend"""
+    for name, value in request.param.items():
+        monkeypatch.setattr(automated_test_runner, name, value)
+    return request.param
+
+
+class TestDumpJsonBytes:
+    """Test suite for dump_json_bytes"""
+
+    def test_plain_data_matches_stdlib(self, backend):
+        """Plain Python data decodes to exactly what json.dumps wrote"""
+        data = {'title': {'project_name': 'Bridge – ₹ Works'}, 'items': [1, 2.5, None, True], 'empty': {}}
+        assert json.loads(dump_json_bytes(data, default=str)) == json.loads(stdlib_json(data, default=str))
+
+    def test_numpy_scalars_stay_numbers(self, backend):
+        """numpy scalars are written as numbers, never as strings"""
+        data = {'quantity': np.float64(1.5), 'count': np.int64(2), 'rate': np.float32(0.5)}
+        decoded = json.loads(dump_json_bytes(data, default=str))
+        assert decoded == {'quantity': 1.5, 'count': 2, 'rate': 0.5}
+        assert isinstance(decoded['count'], int)
+
+    def test_float64_output_matches_stdlib(self, backend):
+        """np.float64, which json always wrote as a number, decodes the same as before"""
+        data = {'amount': np.float64(1234.56), 'rows': [{'rate': np.float64(10.0)}]}
+        assert json.loads(dump_json_bytes(data, default=str)) == json.loads(stdlib_json(data, default=str))
+
+    def test_non_finite_floats_match_stdlib(self, backend):
+        """NaN and Infinity are written as json writes them, not as null"""
+        data = {'quantity': float('nan'), 'rate': np.float64('inf'), 'remark': None}
+        assert dump_json_bytes(data, default=str) == stdlib_json(data, default=str)
+        decoded = json.loads(dump_json_bytes(data, default=str))
+        assert math.isnan(decoded['quantity'])
+        assert decoded['rate'] == math.inf
+        assert decoded['remark'] is None
+
+    def test_default_handles_unknown_types(self, backend):
+        """Objects no encoder knows go through the caller's default"""
+        data = {'path': Path('a/b.xlsx')}
+        assert json.loads(dump_json_bytes(data, default=str)) == {'path': str(Path('a/b.xlsx'))}
+
+    def test_unknown_type_without_default_raises(self, backend):
+        """Without a default, unserializable objects are an error on every backend"""
+        with pytest.raises(TypeError):
+            dump_json_bytes({'value': object()})
+
+
+class TestZipPackage:
+    """Test suite for write_zip_package"""
+
+    @pytest.fixture
+    def runner(self, tmp_path):
+        """A runner writing into a temporary results folder"""
+        with automated_test_runner.AutomatedTestRunner(output_dir=str(tmp_path / "results"), max_workers=1) as runner:
+            yield runner
+
+    def test_members_and_contents(self, runner, tmp_path):
+        """Every document lands under its folder and the JSON members decode"""
+        result = automated_test_runner.TestResult("input.xlsx")
+        result.status = "success"
+        zip_path, members = runner.write_zip_package(
+            tmp_path / "package.zip",
+            {'title': {'project_name': 'Bridge ₹ Works'}, 'amount': np.float64(12.5)},
+            {'first_page': "\\documentclass{article}"},
+            {'first_page': "<h1>First Page</h1>"},
+            result
+        )
+        assert members == ["processed_data.json", "latex_documents/first_page.tex",
+                           "html_documents/first_page.html", "test_summary.json"]
+        with zipfile.ZipFile(zip_path) as zf:
+            assert zf.namelist() == members
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+            assert json.loads(zf.read("processed_data.json")) == {
+                'title': {'project_name': 'Bridge ₹ Works'}, 'amount': 12.5}
+            assert zf.read("html_documents/first_page.html").decode('utf-8') == "<h1>First Page</h1>"
+            assert json.loads(zf.read("test_summary.json"))['filename'] == "input.xlsx"
+
+    def test_empty_document_sets(self, runner, tmp_path):
+        """With no documents the package still holds the data and summary"""
+        result = automated_test_runner.TestResult("input.xlsx")
+        zip_path, members = runner.write_zip_package(tmp_path / "package.zip", {}, {}, {}, result)
+        assert members == ["processed_data.json", "test_summary.json"]
+        with zipfile.ZipFile(zip_path) as zf:
+            assert zf.namelist() == members
@@ -0,0 +1,91 @@
+"""
+Tests for the comprehensive app tester's parse cache and result summaries
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import comprehensive_app_tester
+from comprehensive_app_tester import _cached_process
+
+
+class CountingProcessor:
+    """Stand-in for ExcelProcessor that records how often a workbook is parsed"""
+    parses = 0
+
+    def __init__(self, excel_file):
+        self.payload = excel_file.read()
+
+    def process_all_sheets(self):
+        CountingProcessor.parses += 1
+        return {'title': {'project_name': 'Cached'}, 'size': len(self.payload)}
+
+    def get_processing_summary(self):
+        return {'sheets': 1}
+
+
+@pytest.fixture
+def counting_processor(monkeypatch):
+    """Replace the real parser and reset the parse counter"""
+    CountingProcessor.parses = 0
+    monkeypatch.setattr(comprehensive_app_tester, 'ExcelProcessor', CountingProcessor)
+    return CountingProcessor
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """A stand-in workbook file; the fake parser only reads its bytes"""
+    path = tmp_path / "input.xlsx"
+    path.write_bytes(b"workbook-bytes")
+    return path
+
+
+class TestCachedProcess:
+    """Test suite for _cached_process"""
+
+    def test_without_cache_always_parses(self, counting_processor, workbook):
+        """With no cache directory every call runs the parser"""
+        _cached_process(workbook)
+        _cached_process(workbook)
+        assert counting_processor.parses == 2
+
+    def test_identical_file_is_served_from_cache(self, counting_processor, workbook, tmp_path):
+        """A second call for unchanged bytes and parser returns the stored parse"""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        first = _cached_process(workbook, cache_dir)
+        second = _cached_process(workbook, cache_dir)
+        assert counting_processor.parses == 1
+        assert first == second
+
+    def test_changed_file_is_parsed_again(self, counting_processor, workbook, tmp_path):
+        """Different workbook bytes miss the cache"""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        _cached_process(workbook, cache_dir)
+        workbook.write_bytes(b"edited-workbook-bytes")
+        processed, _ = _cached_process(workbook, cache_dir)
+        assert counting_processor.parses == 2
+        assert processed['size'] == len(b"edited-workbook-bytes")
+
+    def test_changed_parser_code_is_parsed_again(self, counting_processor, workbook, tmp_path, monkeypatch):
+        """A different parser fingerprint invalidates earlier entries"""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        _cached_process(workbook, cache_dir)
+        monkeypatch.setattr(comprehensive_app_tester, '_processor_digest', lambda: b"edited parser")
+        _cached_process(workbook, cache_dir)
+        assert counting_processor.parses == 2
+
+    def test_fingerprint_covers_helper_modules(self):
+        """The parser fingerprint reads the utils module the processor imports from"""
+        module = sys.modules[comprehensive_app_tester.ExcelProcessor.__module__]
+        utils_source = Path(sys.modules[module.clean_text.__module__].__file__).resolve()
+        sources = comprehensive_app_tester._parser_sources()
+        assert Path(module.__file__).resolve() in sources
+        assert utils_source in sources
+        assert all('site-packages' not in str(source) for source in sources)
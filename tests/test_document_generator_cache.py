@@ -0,0 +1,111 @@
+"""
+Tests for the shared extra items render cache in the document generator
+"""
+
+import sys
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import document_generator
+from src.document_generator import render_extra_items_statement_cached
+
+TEMPLATE = "<h1>EXTRA ITEM SLIP</h1><p>{{ data.name_of_work }}</p><p>{{ current_date }}</p>"
+
+
+def make_data(project_name='Bridge Works'):
+    """Minimal processed data for the extra items statement"""
+    return {
+        'title': {'project_name': project_name, 'contractor_name': 'M/s ABC'},
+        'extra_items': [{'description': 'Extra wiring', 'unit': 'Mtr', 'quantity': 2, 'rate': 10}]
+    }
+
+
+@pytest.fixture
+def templates(monkeypatch):
+    """Serve templates from a dict and start every test with an empty cache"""
+    loader = DictLoader({'extra_items.html': TEMPLATE})
+    env = Environment(loader=loader, autoescape=True)
+    monkeypatch.setattr(document_generator, '_build_jinja_environment', lambda templates_dir: env)
+    monkeypatch.setattr(document_generator, '_extra_items_cache', document_generator.OrderedDict())
+    return loader.mapping
+
+
+@pytest.fixture
+def render_count(monkeypatch):
+    """Count real template renders behind the cache"""
+    calls = []
+    original = document_generator.DocumentGenerator.render_extra_items_statement
+
+    def counting(self, current_date):
+        calls.append(current_date)
+        return original(self, current_date)
+
+    monkeypatch.setattr(document_generator.DocumentGenerator, 'render_extra_items_statement', counting)
+    return calls
+
+
+class TestExtraItemsRenderCache:
+    """Test suite for render_extra_items_statement_cached"""
+
+    def test_identical_data_renders_once(self, templates, render_count):
+        """A second call with equal data reuses the cached render"""
+        first = render_extra_items_statement_cached(make_data())
+        second = render_extra_items_statement_cached(make_data())
+        assert first == second
+        assert len(render_count) == 1
+        assert 'Bridge Works' in first
+
+    def test_read_only_mapping_shares_key_with_dict(self, templates, render_count):
+        """MappingProxyType data is keyed by its contents, like the equal dict"""
+        render_extra_items_statement_cached(MappingProxyType(make_data()))
+        render_extra_items_statement_cached(make_data())
+        assert len(render_count) == 1
+
+    def test_date_is_filled_in_per_call(self, templates, monkeypatch):
+        """Cached HTML never carries the date of the render that filled the cache"""
+        monkeypatch.setattr(document_generator, 'format_date', lambda value: '01/01/2026')
+        first = render_extra_items_statement_cached(make_data())
+        monkeypatch.setattr(document_generator, 'format_date', lambda value: '02/01/2026')
+        second = render_extra_items_statement_cached(make_data())
+        assert '01/01/2026' in first
+        assert '02/01/2026' in second and '01/01/2026' not in second
+        assert document_generator._EXTRA_ITEMS_DATE_PLACEHOLDER not in second
+
+    def test_cache_is_bounded(self, templates, monkeypatch):
+        """The least recently used entry is evicted past the size limit"""
+        monkeypatch.setattr(document_generator, 'EXTRA_ITEMS_CACHE_SIZE', 2)
+        for name in ('A', 'B', 'C'):
+            render_extra_items_statement_cached(make_data(name))
+        assert len(document_generator._extra_items_cache) == 2
+
+    def test_failed_render_is_not_cached(self, templates, render_count):
+        """Fallback HTML is returned but a later call tries the template again"""
+        del templates['extra_items.html']
+        fallback = render_extra_items_statement_cached(make_data())
+        assert 'EXTRA ITEM SLIP' not in fallback
+        assert len(document_generator._extra_items_cache) == 0
+
+        templates['extra_items.html'] = TEMPLATE
+        rendered = render_extra_items_statement_cached(make_data())
+        assert 'EXTRA ITEM SLIP' in rendered
+
+    def test_template_edit_invalidates_entries(self, templates, render_count):
+        """Changing the template text misses the cache"""
+        render_extra_items_statement_cached(make_data())
+        templates['extra_items.html'] = TEMPLATE + "<footer>v2</footer>"
+        rendered = render_extra_items_statement_cached(make_data())
+        assert len(render_count) == 2
+        assert 'v2' in rendered
+
+    def test_unsortable_keys_render_without_caching(self, templates, render_count):
+        """Data whose keys cannot be sorted still renders, it is just not cached"""
+        data = make_data()
+        data[1] = 'numeric key'
+        rendered = render_extra_items_statement_cached(data)
+        assert 'EXTRA ITEM SLIP' in rendered
+        assert len(document_generator._extra_items_cache) == 0
@@ -0,0 +1,42 @@
+"""
+Tests for the single-scan needle counter used by the extra items validation
+"""
+
+import sys
+from pathlib import Path
+
+# Make the repository root importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from accurate_extra_items_validation import scan_needles
+
+
+class TestScanNeedles:
+    """Test suite for scan_needles"""
+
+    def test_counts_every_occurrence(self):
+        """Repeated needles are tallied, missing ones count as zero"""
+        hits = scan_needles("₹10 and ₹20 and ₹30", ['₹', 'absent'])
+        assert hits['₹'] == 3
+        assert hits['absent'] == 0
+
+    def test_needle_nested_inside_longer_needle(self):
+        """A needle inside a longer one is still found"""
+        text = "Grand Total Amount of Extra Item Executed"
+        hits = scan_needles(text, ['Grand Total', 'Total Amount of Extra Item Executed'])
+        assert hits['Grand Total'] == 1
+        assert hits['Total Amount of Extra Item Executed'] == 1
+
+    def test_needle_that_is_a_prefix_of_another(self):
+        """Needles starting at the same position are all credited"""
+        hits = scan_needles("Grand Total Amount; Grand Total", ['Grand Total', 'Grand Total Amount'])
+        assert hits['Grand Total'] == 2
+        assert hits['Grand Total Amount'] == 1
+
+    def test_matches_substring_checks(self):
+        """Presence agrees with a plain `in` check for every needle"""
+        text = "<h1>EXTRA ITEM SLIP</h1><p>M/s ABC &amp; Co</p><td>Tender Premium</td>"
+        needles = ['EXTRA ITEM SLIP', 'M/s ABC & Co', 'M/s ABC &amp; Co', 'Tender Premium', 'Premium', 'Grand']
+        hits = scan_needles(text, needles)
+        for needle in needles:
+            assert bool(hits[needle]) == (needle in text)
@@ -0,0 +1,129 @@
+"""
+Tests for the PDF comparison tool's compliance score and comparison cache
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import compare_with_sample_pdf
+from compare_with_sample_pdf import PDFComparisonTool, compliance_score
+
+REAL_BACKENDS = {'jinja2': '3.1.6', 'weasyprint': '62.3', 'reportlab': None, 'wkhtmltopdf': None}
+PLACEHOLDER_BACKENDS = {'jinja2': '3.1.6', 'weasyprint': None, 'reportlab': '4.2.0', 'wkhtmltopdf': None}
+
+
+def reference_score(comparison):
+    """The per-group percentage mean, computed the plain way"""
+    groups = [comparison[name] for name in compare_with_sample_pdf.COMPLIANCE_GROUPS]
+    return sum(sum(group.values()) / len(group) * 100 for group in groups) / len(groups)
+
+
+class TestComplianceScore:
+    """Test suite for compliance_score"""
+
+    def test_all_checks_passing(self):
+        """Every check passing scores 100"""
+        comparison = {
+            'format_compliance': {'a': True, 'b': True},
+            'structure_compliance': {'c': True},
+            'content_compliance': {'d': True, 'e': True, 'f': True}
+        }
+        assert compliance_score(comparison) == 100.0
+
+    def test_groups_weigh_equally(self):
+        """Each group contributes its own percentage, whatever its size"""
+        comparison = {
+            'format_compliance': {'a': True, 'b': False, 'c': False, 'd': False},
+            'structure_compliance': {'e': False},
+            'content_compliance': {'f': True, 'g': True}
+        }
+        assert compliance_score(comparison) == pytest.approx(reference_score(comparison))
+        assert compliance_score(comparison) == pytest.approx((25 + 0 + 100) / 3)
+
+    def test_ignores_other_keys(self):
+        """Recommendations and other entries do not enter the score"""
+        comparison = {
+            'format_compliance': {'a': True},
+            'structure_compliance': {'b': False},
+            'content_compliance': {'c': True},
+            'recommendations': ['x', 'y']
+        }
+        assert compliance_score(comparison) == pytest.approx(200 / 3)
+
+
+@pytest.fixture
+def tool(tmp_path, monkeypatch):
+    """A comparison tool with a sample PDF and a generator made of one source file"""
+    sample = tmp_path / "sample.pdf"
+    sample.write_bytes(b"%PDF-1.4 sample")
+    source = tmp_path / "generator.py"
+    source.write_text("VERSION = 1\n")
+    monkeypatch.setattr(compare_with_sample_pdf, '_comparison_sources', lambda: [source])
+    monkeypatch.setattr(compare_with_sample_pdf, 'pdf_backends', lambda: dict(REAL_BACKENDS))
+    comparison_tool = PDFComparisonTool()
+    comparison_tool.sample_pdf_path = str(sample)
+    return comparison_tool
+
+
+def make_result(tmp_path, html=b"<h1>EXTRA ITEM SLIP</h1>", errors=()):
+    """A generation result pointing at HTML and PDF files written to tmp_path"""
+    html_file = tmp_path / "extra_items_statement.html"
+    html_file.write_bytes(html)
+    pdf_file = tmp_path / "extra_items_statement_html.pdf"
+    pdf_file.write_bytes(b"%PDF-1.4 generated")
+    return {
+        'html_files': {'extra_items_statement': str(html_file)},
+        'pdf_files': {'extra_items_statement_html': str(pdf_file)},
+        'errors': list(errors)
+    }
+
+
+class TestComparisonCache:
+    """Test suite for the comparison cache key and what may be cached"""
+
+    def test_key_is_stable(self, tool):
+        """The same inputs give the same key"""
+        data = {'title': {'project_name': 'P'}}
+        assert tool.comparison_cache_key(data) == tool.comparison_cache_key(data)
+
+    def test_key_changes_with_backends(self, tool, monkeypatch):
+        """A different PDF backend or library version changes the key"""
+        data = {'title': {'project_name': 'P'}}
+        before = tool.comparison_cache_key(data)
+        monkeypatch.setattr(compare_with_sample_pdf, 'pdf_backends', lambda: dict(PLACEHOLDER_BACKENDS))
+        assert tool.comparison_cache_key(data) != before
+
+    def test_key_changes_with_sources(self, tool, tmp_path):
+        """Editing a generator source changes the key"""
+        data = {'title': {'project_name': 'P'}}
+        before = tool.comparison_cache_key(data)
+        (tmp_path / "generator.py").write_text("VERSION = 2\n")
+        assert tool.comparison_cache_key(data) != before
+
+    def test_clean_result_is_cacheable(self, tool, tmp_path):
+        """A rendered HTML with a converted PDF is stored"""
+        assert tool.is_cacheable(make_result(tmp_path))
+
+    def test_errors_are_not_cached(self, tool, tmp_path):
+        """A result carrying errors is not stored"""
+        assert not tool.is_cacheable(make_result(tmp_path, errors=["Error in extra items generation"]))
+
+    def test_missing_pdf_is_not_cached(self, tool, tmp_path):
+        """A result without a PDF is not stored"""
+        result = make_result(tmp_path)
+        result['pdf_files'] = {}
+        assert not tool.is_cacheable(result)
+
+    def test_fallback_html_is_not_cached(self, tool, tmp_path):
+        """The error page written when the template fails is not stored"""
+        html = b"<div class=\"error\"><strong>Error:</strong> Unable to generate document. missing</div>"
+        assert not tool.is_cacheable(make_result(tmp_path, html=html))
+
+    def test_placeholder_pdf_is_not_cached(self, tool, tmp_path, monkeypatch):
+        """Without a real converter the PDF is a placeholder and is not stored"""
+        monkeypatch.setattr(compare_with_sample_pdf, 'pdf_backends', lambda: dict(PLACEHOLDER_BACKENDS))
+        assert not tool.is_cacheable(make_result(tmp_path))